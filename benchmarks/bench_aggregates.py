@@ -0,0 +1,43 @@
+"""Benchmark the panel aggregation engine against the per-panel groupbys.
+
+Usage: python benchmarks/bench_aggregates.py [rows ...]
+
+Builds a synthetic sheet of the given sizes, runs it through ``load_data``
+and times ``PanelAggregates`` against the groupbys the pages ran before it,
+after checking that both produce the same tables. The groupbys and the
+check live in ``tests/test_aggregates.py``, which runs them on every test
+run.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from srr.aggregates import PanelAggregates  # noqa: E402
+from srr.snapshot import load_data  # noqa: E402
+from srr.synthetic import synthetic_sheet  # noqa: E402
+from tests.test_aggregates import assert_same_panels, legacy_panels  # noqa: E402
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'legacy':>10} {'engine':>10} {'speedup':>8}")
+    for rows in sizes:
+        df = load_data(synthetic_sheet(rows))
+        assert_same_panels(PanelAggregates(df), df)
+        legacy = best_of(lambda: legacy_panels(df))
+        engine = best_of(lambda: PanelAggregates(df))
+        print(f'{rows:>10,} {legacy * 1000:>8.1f}ms {engine * 1000:>8.1f}ms {legacy / engine:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,304 @@
+"""Headless benchmark suite for SRR ingest, filtering, aggregation and pages.
+
+Usage:
+    python benchmarks/bench_suite.py [--rows N ...] [--repeat R] [--seed S] [--no-pages] [--json PATH]
+    python benchmarks/bench_suite.py --compare BASE.json NEW.json
+
+For each size, a synthetic sheet (``srr.synthetic``) is written to a
+Parquet file and measured through every stage a refresh and a page rerun
+go through:
+
+ingest     reading the sheet, ``parse_durations``, ``load_data``, the
+           snapshot indexes and a full and an incremental store refresh
+filter     ``FilterIndex.select`` for each Service and each Month
+aggregate  each ``PanelAggregates`` block over every row, the cube path a
+           page view takes, and a whole view's ``PanelResults``
+page       each page script through Streamlit's AppTest, served from the
+           file by ``SRR_DATA_SOURCE``. Measured for a cold first load, a
+           new session, a rerun and a Service filter change.
+
+Each benchmark records its best wall time over ``--repeat`` runs. Its peak
+traced memory is measured in one extra run, so tracing does not skew the
+times. tracemalloc sees Python and NumPy allocations but not Arrow's, so
+the process's peak RSS is recorded too. Results are printed as a table. With ``--json`` they
+are also written as JSON, with the environment they were measured in.
+``--compare`` prints the time and memory ratios of two such files.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pyarrow as pa  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from srr.aggregates import PanelAggregates  # noqa: E402
+from srr.cube import RollupCube  # noqa: E402
+from srr.durations import parse_durations  # noqa: E402
+from srr.exports import get_export_cache, get_export_dir  # noqa: E402
+from srr.filters import FilterIndex  # noqa: E402
+from srr.lottie import load_animations  # noqa: E402
+from srr.panels import PanelResults, get_panel_cache  # noqa: E402
+from srr.schema import DURATION_COLUMNS  # noqa: E402
+from srr.snapshot import Snapshot, SnapshotStore, get_store, load_data, read_sheet  # noqa: E402
+from srr.sources import DATA_SOURCE_ENV, LocalSheetConnection  # noqa: E402
+from srr.synthetic import synthetic_sheet, write_fixture  # noqa: E402
+from srr.timeline import TimeIndex  # noqa: E402
+
+PAGE_SCRIPTS = ['1_Raw_SRR_Data.py', 'pages/2_Working_Hours.py', 'pages/3_Off_Hours.py']
+# Seconds AppTest waits for one page run
+PAGE_TIMEOUT = 600
+# Bump when benchmarks are renamed or measure something else
+RESULTS_FORMAT = 1
+
+
+def measure(func, repeat, setup=None):
+    """Best wall time of ``func()`` over ``repeat`` runs, and its traced peak bytes.
+
+    ``setup()``, if given, runs untimed before every run.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+class Suite:
+    """Runs benchmarks and collects their results."""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def run(self, name, rows, func, ops=1, setup=None):
+        seconds, peak = measure(func, self.repeat, setup)
+        result = {'name': name, 'rows': rows, 'seconds': seconds, 'ops': ops, 'peak_bytes': peak}
+        self.results.append(result)
+        print(f'{rows:>10,} {name:<32} {seconds / ops * 1000:>10.2f}ms {peak / 2**20:>9.1f}MiB'
+              + (f'  ({ops} ops)' if ops > 1 else ''), flush=True)
+        return result
+
+
+def bench_ingest(suite, rows, path):
+    conn = LocalSheetConnection('srr_bench', path=str(path))
+    raw = read_sheet(conn)
+    suite.run('ingest.read', rows, lambda: read_sheet(conn))
+    suite.run('ingest.parse_durations', rows, lambda: [parse_durations(raw[col]) for col in DURATION_COLUMNS])
+    suite.run('ingest.load_data', rows, lambda: load_data(raw))
+    frame = load_data(raw)
+    suite.run('ingest.filter_index', rows, lambda: FilterIndex(frame))
+    suite.run('ingest.time_index', rows, lambda: TimeIndex(frame))
+    suite.run('ingest.rollup_cube', rows, lambda: RollupCube.build(frame))
+    suite.run('ingest.snapshot', rows, lambda: Snapshot(frame, 1))
+
+    read = partial(read_sheet, conn)
+    suite.run('ingest.refresh_full', rows, lambda: SnapshotStore(read).refresh())
+    # Always stale, so every refresh re-reads the tail of the sheet
+    store = SnapshotStore(read, refresh_seconds=0)
+    store.refresh()
+    suite.run('ingest.refresh_incremental', rows, store.refresh)
+    return Snapshot(frame, 1)
+
+
+def _views(snapshot):
+    """(Service, Month) views one filter change away from All / All, and All / All."""
+    services = list(snapshot.frame['Service'].cat.categories)
+    months = list(snapshot.frame['Month'].cat.categories)
+    return [(None, None)] + [(service, None) for service in services] + [(None, month) for month in months]
+
+
+def bench_filter(suite, rows, snapshot):
+    views = _views(snapshot)
+    filters = snapshot.filters
+    suite.run('filter.select', rows, lambda: [filters.select('all', s, m) for s, m in views], ops=len(views))
+    suite.run('filter.select_working', rows, lambda: [filters.select('working', s, m) for s, m in views], ops=len(views))
+
+
+def bench_aggregate(suite, rows, snapshot):
+    frame, cube = snapshot.frame, snapshot.cube
+    for block in PanelAggregates.BLOCKS:
+        suite.run(f'aggregate.{block}', rows, lambda: PanelAggregates.only(frame, block))
+    suite.run('aggregate.all_rows', rows, lambda: PanelAggregates(frame))
+
+    views = _views(snapshot)
+
+    def from_cube():
+        for service, month in views:
+            PanelAggregates.from_cells(*(cube.cells(name, 'all', service, month) for name in ('hourly', 'sme', 'sme_on_it', 'requestor')))
+
+    suite.run('aggregate.cube_view', rows, from_cube, ops=len(views))
+    today = pd.Timestamp.now(tz='America/Los_Angeles')
+    start, end = today - pd.Timedelta(days=30), today
+    suite.run('panels.view', rows, lambda: [PanelResults(snapshot, 'all', s, m, start, end) for s, m in views], ops=len(views))
+
+
+class PageRunner:
+    """Runs page scripts through AppTest on one sheet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._store_open = False
+
+    def __enter__(self):
+        os.environ[DATA_SOURCE_ENV] = str(self.path)
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+        os.environ.pop(DATA_SOURCE_ENV, None)
+
+    def reset(self):
+        """Drop the snapshot and every per-view cache, so the next run is cold."""
+        if self._store_open:
+            # Only asked for once a page has created it, so this never loads one
+            get_store().stop_worker(timeout=5)
+            self._store_open = False
+        for cached in (get_store, get_panel_cache, get_export_cache, get_export_dir):
+            cached.clear()
+
+    def run(self, at, script):
+        at.run(timeout=PAGE_TIMEOUT)
+        self._store_open = True
+        if at.exception:
+            raise RuntimeError(f"{script}: {at.exception[0].value}")
+        return at
+
+    def new_session(self, script):
+        return self.run(AppTest.from_file(str(ROOT / script)), script)
+
+
+def bench_pages(suite, rows, path):
+    # Fetched once per process; kept out of the page times
+    load_animations()
+    with PageRunner(path) as pages:
+        pages.reset()
+        suite.run('page.cold_load', rows, lambda: pages.new_session(PAGE_SCRIPTS[0]), setup=pages.reset)
+        for script in PAGE_SCRIPTS:
+            name = Path(script).stem.split('_', 1)[1].lower()
+            at = pages.new_session(script)
+            suite.run(f'page.{name}.session', rows, lambda: pages.new_session(script))
+            suite.run(f'page.{name}.rerun', rows, lambda: pages.run(at, script))
+
+            def change_service():
+                for service in ('VCC', 'All'):
+                    at.selectbox[0].select(service)
+                    pages.run(at, script)
+
+            suite.run(f'page.{name}.filter', rows, change_service, ops=2)
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'format': RESULTS_FORMAT,
+        'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'packages': {
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'pyarrow': pa.__version__,
+            'streamlit': st.__version__,
+        },
+    }
+
+
+def main(args):
+    # Pages run headless here; their "no runtime" warnings are expected, and
+    # an offline run cannot fetch the animations
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    logging.getLogger('srr.lottie').setLevel(logging.ERROR)
+    suite = Suite(args.repeat)
+    report = environment()
+    report.update(sizes=args.rows, repeat=args.repeat, seed=args.seed)
+    print(f"{'rows':>10} {'benchmark':<32} {'time/op':>12} {'peak':>12}")
+    with tempfile.TemporaryDirectory(prefix='srr-bench-') as tmp:
+        for rows in args.rows:
+            path = write_fixture(synthetic_sheet(rows, seed=args.seed), Path(tmp) / f'sheet-{rows}.parquet')
+            snapshot = bench_ingest(suite, rows, path)
+            bench_filter(suite, rows, snapshot)
+            bench_aggregate(suite, rows, snapshot)
+            del snapshot
+            if args.pages:
+                bench_pages(suite, rows, path)
+    # ru_maxrss is in KiB on Linux (bytes on macOS)
+    report['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    report['results'] = suite.results
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1))
+        print(f"Wrote {len(suite.results)} results to {args.json}")
+
+
+def compare(base_path, new_path):
+    """Print the time and peak memory of ``new_path``'s results relative to ``base_path``'s."""
+    base, new = (json.loads(Path(p).read_text()) for p in (base_path, new_path))
+    if base.get('format') != new.get('format'):
+        print("Warning: the files were written by different versions of the suite")
+    before = {(r['name'], r['rows']): r for r in base['results']}
+    print(f"{'rows':>10} {'benchmark':<32} {'base':>10} {'new':>10} {'time':>7} {'memory':>7}")
+    for result in new['results']:
+        old = before.get((result['name'], result['rows']))
+        if old is None:
+            continue
+        memory = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else float('nan')
+        print(f"{result['rows']:>10,} {result['name']:<32} "
+              f"{old['seconds'] / old['ops'] * 1000:>8.2f}ms {result['seconds'] / result['ops'] * 1000:>8.2f}ms "
+              f"{result['seconds'] / old['seconds']:>6.2f}x {memory:>6.2f}x")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SRR ingest, filtering, aggregation and pages.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="sheet sizes to run (default: 10k 100k 1M)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark; the best is kept")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic sheet seed")
+    parser.add_argument('--no-pages', dest='pages', action='store_false', help="skip the AppTest page runs")
+    parser.add_argument('--json', metavar='PATH', help="write the results to PATH as JSON")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help="compare two --json result files")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        main(args)
@@ -0,0 +1,7 @@
+"""Shared SRR data layer used by the dashboard pages.
+
+Import from the submodules, e.g. ``from srr.page import render_page``.
+Nothing is imported here, so ``python -m srr.synthetic`` or a headless use
+of the engine (``srr.snapshot``, ``srr.panels``) does not load the
+dashboard stack (st_aggrid, plotly, Lottie).
+"""
@@ -0,0 +1,256 @@
+"""Every panel aggregate of a page, computed together from shared key codes.
+
+The pages used to run a dozen groupbys over the same filtered frame, each
+re-factorizing its keys. ``PanelAggregates`` takes the codes of each key
+once (the categorical codes, or a single factorize for ``Hour_Created``)
+and computes all counts, sums and means with weighted ``np.bincount``.
+
+The input is a set of weighted rows: either raw SRR rows (every row counts
+once) or cells of the rollup cube, which carry pre-summed measures. Each
+table exposed is the same frame the groupby it replaces returned.
+"""
+import numpy as np
+import pandas as pd
+
+from srr.timing import span
+
+ON_IT = 'TimeTo: On It Sec'
+ATTENDED = 'TimeTo: Attended Sec'
+_TIMES = {ON_IT: 'on_it_sum', ATTENDED: 'attended_sum'}
+
+# Additive measures kept per cube cell (and derived per raw row)
+MEASURES = ('count', 'on_it_sum', 'on_it_valid', 'attended_sum', 'attended_valid', 'survey_sum', 'survey_count')
+
+
+def row_measures(frame):
+    """The additive measures of each raw row of ``frame``, as float64 arrays.
+
+    Duration sums use the zero-filled seconds; ``*_valid`` counts the rows
+    whose duration parsed, which is what the Timedelta means average over.
+    """
+    survey = frame['Survey'].to_numpy(dtype=np.float64)
+    survey_valid = ~np.isnan(survey)
+    return {
+        'count': np.ones(len(frame)),
+        'on_it_sum': frame[ON_IT].to_numpy(dtype=np.float64),
+        'on_it_valid': frame['TimeTo: On It Timedelta'].notna().to_numpy(dtype=np.float64),
+        'attended_sum': frame[ATTENDED].to_numpy(dtype=np.float64),
+        'attended_valid': frame['TimeTo: Attended Timedelta'].notna().to_numpy(dtype=np.float64),
+        'survey_sum': np.where(survey_valid, survey, 0.0),
+        'survey_count': survey_valid.astype(np.float64),
+    }
+
+
+class _Key:
+    """Group codes of one key column; -1 marks a missing key."""
+
+    def __init__(self, series):
+        self.name = series.name
+        self.dtype = series.dtype
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            self.codes = series.cat.codes.to_numpy(dtype=np.int64)
+            self.labels = series.cat.categories
+        else:
+            codes, labels = pd.factorize(series, sort=True)
+            self.codes = codes.astype(np.int64, copy=False)
+            self.labels = pd.Index(labels)
+        self.size = len(self.labels)
+
+    def column(self, codes):
+        """Key values for ``codes``, with the dtype of the source column."""
+        if isinstance(self.dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(codes, dtype=self.dtype)
+        return self.labels.take(codes).to_numpy()
+
+    def index(self, codes):
+        if isinstance(self.dtype, pd.CategoricalDtype):
+            return pd.CategoricalIndex(self.column(codes), name=self.name)
+        return pd.Index(self.column(codes), name=self.name)
+
+
+class _Rows:
+    """Key columns and additive measures of the rows being aggregated."""
+
+    def __init__(self, frame, measures):
+        self.frame = frame
+        self.measures = measures
+        self.length = len(frame)
+        self._keys = {}
+
+    def key(self, column):
+        if column not in self._keys:
+            self._keys[column] = _Key(self.frame[column])
+        return self._keys[column]
+
+
+class _Grouping:
+    """Weighted rows grouped by one or two keys, ready for bincount."""
+
+    def __init__(self, rows, *columns):
+        keys = [rows.key(col) for col in columns]
+        self.keys = keys
+        self.shape = tuple(key.size for key in keys)
+        valid = np.ones(rows.length, dtype=bool)
+        for key in keys:
+            valid &= key.codes >= 0
+        # Rows with a missing key belong to no group
+        self.valid = None if valid.all() else valid
+        codes = [self._rows(key.codes) for key in keys]
+        self.flat = np.ravel_multi_index(codes, self.shape) if len(codes[0]) else np.empty(0, dtype=np.int64)
+        self.length = int(np.prod(self.shape))
+        self._measures = rows.measures
+        self._totals = {}
+
+    def _rows(self, values):
+        return values if self.valid is None else values[self.valid]
+
+    def total(self, measure):
+        """Sum of ``measure`` per group, as an array of the grouping's shape."""
+        if measure not in self._totals:
+            weights = self._rows(self._measures[measure])
+            sums = np.bincount(self.flat, weights=weights, minlength=self.length)
+            self._totals[measure] = sums.reshape(self.shape)
+        return self._totals[measure]
+
+    def count(self):
+        return self.total('count').astype(np.int64)
+
+    def mean(self, measure, count='count'):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.total(measure) / self.total(count)
+
+
+class PanelAggregates:
+    """All aggregates the dashboard panels render, for one filtered frame.
+
+    Attributes (each mirrors the groupby the pages used to run):
+
+    ``hour_service``      interactions per Hour_Created x Service
+    ``hour_on_it``        mean TimeTo: On It Sec per Hour_Created
+    ``hour_case_reason``  interactions per Hour_Created x Case Reason
+    ``month_times``       mean On It / Attended seconds per Month
+    ``service_times``     mean On It / Attended seconds per Service
+    ``case_reason_counts`` interactions per Case Reason
+    ``case_reason_times`` mean On It / Attended seconds per Case Reason
+    ``service_counts``    interactions per Service, most first
+    ``sme_service``       interactions per SME x Service (long form)
+    ``requestor_service`` interactions per Requestor x Service
+    ``sme_summary``       per SME (On It) means, count and survey average
+    """
+
+    # Groups of tables built together, in build order; each is built by
+    # ``_build_<name>`` from the rows it needs
+    BLOCKS = ('hourly', 'monthly', 'service', 'case_reason', 'sme', 'requestor')
+
+    def __init__(self, df):
+        rows = _Rows(df, row_measures(df))
+        self._build(rows, rows, rows, rows)
+
+    @classmethod
+    def from_cells(cls, hourly, sme, sme_on_it, requestor):
+        """Aggregate pre-summed cube cells instead of raw rows.
+
+        Each argument is a frame of cube cells (key columns plus the
+        ``MEASURES`` columns) holding the keys its panels group by.
+        """
+        self = cls.__new__(cls)
+        self._build(*(
+            _Rows(cells, {m: cells[m].to_numpy(dtype=np.float64) for m in MEASURES})
+            for cells in (hourly, sme, sme_on_it, requestor)
+        ))
+        return self
+
+    @classmethod
+    def only(cls, df, *blocks):
+        """Aggregate the raw rows of ``df`` into the named ``BLOCKS`` only.
+
+        For profiling one block at a time; the tables of other blocks are
+        left unset.
+        """
+        self = cls.__new__(cls)
+        rows = _Rows(df, row_measures(df))
+        for block in blocks:
+            getattr(self, f'_build_{block}')(rows, rows, rows, rows)
+        return self
+
+    def _build(self, *rows):
+        for block in self.BLOCKS:
+            with span(f'aggregate.{block}'):
+                getattr(self, f'_build_{block}')(*rows)
+
+    def _build_hourly(self, hourly, sme_rows, sme_on_it_rows, requestor_rows):
+        self.hour_service = _wide(_Grouping(hourly, 'Hour_Created', 'Service')).reset_index()
+        self.hour_on_it = _means(_Grouping(hourly, 'Hour_Created'), {ON_IT: 'on_it_sum'}).reset_index()
+        self.hour_case_reason = _wide(_Grouping(hourly, 'Hour_Created', 'Case Reason')).reset_index()
+
+    def _build_monthly(self, hourly, sme_rows, sme_on_it_rows, requestor_rows):
+        self.month_times = _means(_Grouping(hourly, 'Month'), _TIMES).reset_index()
+
+    def _build_service(self, hourly, sme_rows, sme_on_it_rows, requestor_rows):
+        by_service = _Grouping(hourly, 'Service')
+        self.service_times = _means(by_service, _TIMES).reset_index()
+
+        service = by_service.keys[0]
+        counts = pd.Series(by_service.count(), index=service.labels).sort_values(ascending=False)
+        counts = counts[counts > 0]
+        self.service_counts = pd.DataFrame({
+            'Service': pd.Categorical(counts.index, dtype=service.dtype),
+            'Count': counts.to_numpy(),
+        })
+
+    def _build_case_reason(self, hourly, sme_rows, sme_on_it_rows, requestor_rows):
+        by_case_reason = _Grouping(hourly, 'Case Reason')
+        counts = by_case_reason.count()
+        present = np.flatnonzero(counts)
+        self.case_reason_counts = pd.DataFrame({
+            'Case Reason': by_case_reason.keys[0].column(present),
+            'Service': counts[present],
+        })
+        self.case_reason_times = _means(by_case_reason, _TIMES).reset_index()
+
+    def _build_sme(self, hourly, sme_rows, sme_on_it_rows, requestor_rows):
+        by_sme = _Grouping(sme_rows, 'SME', 'Service')
+        counts = by_sme.count()
+        sme_codes, service_codes = np.nonzero(counts)
+        self.sme_service = pd.DataFrame({
+            'SME': by_sme.keys[0].column(sme_codes),
+            'Service': by_sme.keys[1].column(service_codes),
+            'count': counts[sme_codes, service_codes],
+        })
+
+        by_sme_on_it = _Grouping(sme_on_it_rows, 'SME (On It)')
+        size = by_sme_on_it.count()
+        present = np.flatnonzero(size)
+        self.sme_summary = pd.DataFrame({
+            'SME (On It)': by_sme_on_it.keys[0].column(present),
+            'Avg_On_It_Sec': by_sme_on_it.mean('on_it_sum')[present],
+            'Avg_Attended_Sec': by_sme_on_it.mean('attended_sum')[present],
+            'Number_of_Interactions': size[present],
+            'Avg_Survey': by_sme_on_it.mean('survey_sum', 'survey_count')[present],
+        })
+
+    def _build_requestor(self, hourly, sme_rows, sme_on_it_rows, requestor_rows):
+        self.requestor_service = _wide(_Grouping(requestor_rows, 'Requestor', 'Service')).reset_index()
+
+
+def _wide(grouping):
+    """Two-key group sizes as a table: observed first keys by observed second keys."""
+    rows_key, columns_key = grouping.keys
+    counts = grouping.count()
+    rows = np.flatnonzero(counts.any(axis=1))
+    columns = np.flatnonzero(counts.any(axis=0))
+    return pd.DataFrame(
+        counts[np.ix_(rows, columns)],
+        index=rows_key.index(rows),
+        columns=columns_key.index(columns),
+    )
+
+
+def _means(grouping, measures):
+    """Per-group means of each summed measure, over observed groups."""
+    (key,) = grouping.keys
+    present = np.flatnonzero(grouping.count())
+    return pd.DataFrame(
+        {name: grouping.mean(measure)[present] for name, measure in measures.items()},
+        index=key.index(present),
+    )
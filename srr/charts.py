@@ -0,0 +1,192 @@
+"""Dashboard charts, built once per distinct input table.
+
+Building a Plotly figure or validating an Altair chart costs far more than
+drawing it, and most reruns draw the same tables again. Each builder here is
+memoized on the content of the tables it is given (Streamlit hashes frames
+by value), so a chart is built once per distinct aggregate and shared by
+every session. Plotly builders return the figure, which pages must not
+modify. Altair builders return the Vega-Lite spec, already validated, for
+``show_spec``.
+"""
+import functools
+
+import altair as alt
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from srr.timing import span
+
+# Colors of the known Services; any other Service gets Plotly's next default
+SERVICE_COLORS = {
+    "VCC": "#0068C9",
+    "AMC": "LightSkyBlue",
+    "Network": "Red",
+    "WFO": "Orange",
+    "CRM": "#29B09D"
+}
+# Distinct charts kept per builder; a few views' worth per snapshot
+CHART_CACHE_ENTRIES = 64
+
+_memoize = st.cache_resource(show_spinner=False, max_entries=CHART_CACHE_ENTRIES)
+
+
+def _cached(builder):
+    """Memoize ``builder``; each call is timed as a ``chart.<name>`` span."""
+    cached = _memoize(builder)
+    name = f'chart.{builder.__name__}'
+
+    @functools.wraps(builder)
+    def build(*args, **kwargs):
+        with span(name):
+            return cached(*args, **kwargs)
+
+    build.clear = cached.clear
+    return build
+
+
+def show_spec(spec, use_container_width=False):
+    """Draw a spec from one of the Altair builders."""
+    st.vega_lite_chart(spec=spec, use_container_width=use_container_width)
+
+
+def _spec(chart):
+    spec = chart.to_dict()
+    if alt.themes.active == 'default':
+        # The default theme only adds a fixed view size; st.altair_chart drops
+        # it too so charts can fill their column
+        spec.pop('config', None)
+    return spec
+
+
+@_cached
+def hourly_service_figure(table, colors):
+    """Stacked interactions per hour and Service, with each hour's total on top.
+
+    ``table`` has Hour_Created, one column per Service and a Total column.
+    """
+    services = table.columns[1:-1]
+    fig = px.bar(table, x='Hour_Created', y=services,
+                 title='Hourly Interactions by Service',
+                 labels={'value': 'Interactions', 'Hour_Created': 'Hour of Creation', 'variable': 'Service'},
+                 category_orders={'Service': services},
+                 color_discrete_map=colors)
+    fig.update_layout(barmode='stack')
+    # One text trace for every total instead of an annotation per hour
+    fig.add_trace(go.Scatter(
+        x=table['Hour_Created'], y=table['Total'], text=table['Total'].astype(str),
+        mode='text', textposition='top center', textfont=dict(color='black', size=10),
+        showlegend=False, hoverinfo='skip',
+    ))
+    return fig
+
+
+@_cached
+def hourly_on_it_figure(table):
+    return px.line(table, x='Hour_Created', y='TimeTo: On It Minutes', title='Average Timeto: On It By The Hour')
+
+
+@_cached
+def case_reason_hour_figure(table):
+    """Stacked case reasons per hour, from the wide Hour_Created x Case Reason table."""
+    long = table.melt(id_vars=['Hour_Created'], var_name='Case Reason', value_name='Count')
+    fig = px.bar(long, x='Hour_Created', y='Count', color='Case Reason', barmode='stack', title='Case Reason Distribution by Hour')
+    fig.update_layout(
+        xaxis_title='Hour',
+        yaxis_title='Count',
+        legend_title='Case Reason',
+        xaxis=dict(tickangle=0)
+    )
+    return fig
+
+
+@_cached
+def case_reason_pie_figure(counts):
+    counts = counts.sort_values(by='Service', ascending=True)
+    return px.pie(counts, values='Service', names='Case Reason', title='Distribution of Case Reasons', hole=0.5)
+
+
+@_cached
+def service_count_figure(counts, colors):
+    fig = px.bar(counts, x='Service', y='Count', color='Service', text='Count',
+                 title='Interaction Count',
+                 color_discrete_map=colors)
+    fig.update_traces(textposition='outside')
+    fig.update_layout(uniformtext_minsize=8, uniformtext_mode='hide', xaxis_tickangle=-0)
+    fig.update_layout(width=800, height=600)
+    return fig
+
+
+@_cached
+def sme_service_figure(table, colors):
+    """Horizontal interactions per SME by Service, busiest SME first."""
+    sme_order = table.groupby('SME', observed=True)['count'].sum().sort_index().sort_values(ascending=False).index
+    fig = px.bar(table, x='count', y='SME', color='Service',
+                 title='Interactions Handled by SME Attended',
+                 orientation='h',
+                 category_orders={'SME': list(sme_order)},
+                 color_discrete_map=colors)
+    fig.update_layout(
+        xaxis_title='Interaction Count',
+        yaxis_title='SME',
+        width=700,
+        height=600
+    )
+    return fig
+
+
+def _stacked_minutes_spec(table, field, x, title):
+    return _spec(alt.Chart(table).mark_bar().encode(
+        x=x,
+        y=alt.Y('Minutes', stack='zero'),
+        color='Category',
+        tooltip=[field, 'Category', 'Minutes']
+    ).properties(
+        title=title,
+        width=800,
+        height=600
+    ))
+
+
+@_cached
+def monthly_times_spec(table, month_order):
+    """Stacked On It / Attended minutes per Month, from the long Category table."""
+    return _stacked_minutes_spec(table, 'Month', alt.X('Month', sort=list(month_order)), 'Monthly Response Times')
+
+
+@_cached
+def service_times_spec(table):
+    """Stacked On It / Attended minutes per Service, from the long Category table."""
+    return _stacked_minutes_spec(table, 'Service', 'Service', 'Group Response Times')
+
+
+@_cached
+def sme_on_it_spec(table):
+    """Average On It minutes per SME, red above five minutes."""
+    return _spec(alt.Chart(table).mark_bar().encode(
+        x=alt.X('SME', title='SME', sort='-y'),
+        y=alt.Y('Avg_On_It_Min:Q', title='Average Time On It (Minutes)'),
+        color=alt.condition(
+            alt.datum.Avg_On_It_Min > 5,
+            alt.value('red'),
+            alt.value('steelblue')
+        ),
+        tooltip=['SME', alt.Tooltip('Avg_On_It_Min:Q', title='Average Time On It (Minutes)')]
+    ).properties(
+        width=600,
+        height=400,
+        title='Average Time On It by SME'
+    ))
+
+
+@_cached
+def sme_attended_spec(table):
+    return _spec(alt.Chart(table).mark_bar().encode(
+        x=alt.X('SME', title='SME', sort='-y'),
+        y=alt.Y('Avg_Attended_Min:Q', title='Average Time Attended (Minutes)'),
+        tooltip=['SME', alt.Tooltip('Avg_Attended_Min:Q', title='Average Time Attended (Minutes)')]
+    ).properties(
+        width=600,
+        height=400,
+        title='Average Time Attended by SME'
+    ))
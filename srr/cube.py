@@ -0,0 +1,138 @@
+"""Pre-aggregated rollup cube of SRR cases.
+
+Every panel is a count, sum or mean over a handful of dimensions, so each
+snapshot carries a few materialized cuboids: one row per distinct key
+combination, holding the additive ``MEASURES`` of the cases in it. Every
+cuboid includes the filter dimensions, so a page view is answered by
+slicing cuboids (a few thousand cells) instead of scanning case rows.
+
+Because the measures are additive, a refresh updates the cube from the
+rows it replaced and the rows it read: old cells minus the replaced rows
+plus the new ones, rolled up again. History is never re-aggregated.
+"""
+import numpy as np
+import pandas as pd
+
+from srr.aggregates import MEASURES, row_measures
+from srr.filters import FILTER_COLUMNS, SEGMENTS
+
+# Cuboid name -> dimensions it adds to FILTER_COLUMNS
+CUBOIDS = {
+    'hourly': ('Hour_Created', 'Case Reason'),
+    'sme': ('SME',),
+    'sme_on_it': ('SME (On It)',),
+    'requestor': ('Requestor',),
+}
+
+
+def _codes(series):
+    """Codes shifted by one (0 = missing) and the labels they index."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64) + 1, series.cat.categories
+    codes, labels = pd.factorize(series, sort=True)
+    return codes.astype(np.int64) + 1, pd.Index(labels)
+
+
+def _column(series, codes, labels):
+    """Rebuild a key column of ``series``'s dtype from shifted codes."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(codes - 1, dtype=series.dtype)
+    if not len(labels):
+        return np.full(len(codes), np.nan)
+    values = labels.to_numpy().take(np.maximum(codes - 1, 0))
+    # Only a missing key turns an integer column into floats, as in pandas
+    return np.where(codes == 0, np.nan, values) if (codes == 0).any() else values
+
+
+def rollup(frame, dimensions, measures):
+    """Sum ``measures`` (arrays aligned with ``frame``) per distinct key of ``dimensions``.
+
+    Missing keys are a key of their own, so no row is dropped. Cells whose
+    count sums to zero are left out.
+    """
+    coded = [_codes(frame[dim]) for dim in dimensions]
+    sizes = [len(labels) + 1 for _, labels in coded]
+    if len(frame):
+        keys = np.ravel_multi_index([codes for codes, _ in coded], sizes)
+    else:
+        keys = np.empty(0, dtype=np.int64)
+    cells, inverse = np.unique(keys, return_inverse=True)
+    sums = {m: np.bincount(inverse, weights=measures[m], minlength=len(cells)) for m in MEASURES}
+    keep = sums['count'] != 0
+    cell_codes = np.unravel_index(cells[keep], sizes)
+    columns = {
+        dim: _column(frame[dim], codes, labels)
+        for dim, codes, (_, labels) in zip(dimensions, cell_codes, coded)
+    }
+    columns.update({m: sums[m][keep] for m in MEASURES})
+    return pd.DataFrame(columns)
+
+
+class RollupCube:
+    """The materialized cuboids of one snapshot; never modified once built."""
+
+    def __init__(self, cuboids):
+        self.cuboids = cuboids
+
+    @classmethod
+    def build(cls, frame):
+        """Roll every cuboid up from the case rows of ``frame``."""
+        measures = row_measures(frame)
+        return cls({
+            name: rollup(frame, FILTER_COLUMNS + dims, measures)
+            for name, dims in CUBOIDS.items()
+        })
+
+    def updated(self, removed, added, frame):
+        """A new cube with the ``removed`` rows taken out and ``added`` put in.
+
+        ``frame`` is the snapshot the new cube belongs to; the key columns
+        take its categorical dtypes so cube cells and case rows agree.
+        """
+        removed_measures = {m: -values for m, values in row_measures(removed).items()}
+        added_measures = row_measures(added)
+        cuboids = {}
+        for name, dims in CUBOIDS.items():
+            dimensions = FILTER_COLUMNS + dims
+            parts = [
+                self.cuboids[name],
+                rollup(removed, dimensions, removed_measures),
+                rollup(added, dimensions, added_measures),
+            ]
+            parts = [_align(part, frame, dimensions, categorical_only=True) for part in parts if len(part)]
+            if not parts:
+                cuboids[name] = _align(self.cuboids[name], frame, dimensions)
+                continue
+            cells = pd.concat(parts, ignore_index=True)
+            cells = rollup(cells, dimensions, {m: cells[m].to_numpy() for m in MEASURES})
+            cuboids[name] = _align(cells, frame, dimensions)
+        return RollupCube(cuboids)
+
+    def cells(self, name, segment='all', service=None, month=None):
+        """Cells of a cuboid within a page view (None = any)."""
+        cells = self.cuboids[name]
+        mask = np.ones(len(cells), dtype=bool)
+        for column, wanted in zip(FILTER_COLUMNS, (service, month, SEGMENTS[segment])):
+            if wanted is not None:
+                mask &= (cells[column] == wanted).to_numpy()
+        return cells if mask.all() else cells[mask]
+
+    def totals(self, segment='all', service=None, month=None):
+        """Every measure summed over a page view."""
+        cells = self.cells('hourly', segment, service, month)
+        return {m: float(cells[m].sum()) for m in MEASURES}
+
+
+def _align(cells, frame, dimensions, categorical_only=False):
+    """``cells`` with its key columns given the dtypes of ``frame``.
+
+    Categoricals are recoded by label; a float key whose missing cells have
+    all been removed goes back to the frame's integer dtype.
+    """
+    recoded = {
+        dim: cells[dim].astype(frame[dim].dtype)
+        for dim in dimensions
+        if cells[dim].dtype != frame[dim].dtype
+        and (not categorical_only or isinstance(frame[dim].dtype, pd.CategoricalDtype))
+    }
+    return cells.assign(**recoded) if recoded else cells
@@ -0,0 +1,84 @@
+"""Vectorized handling of the sheet's ``H:MM:SS`` duration columns."""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_HMS = r'^\s*(?P<sign>[-+]?)(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+)\s*$'
+
+
+def parse_durations(values):
+    """Parse a Series of ``H:MM:SS`` strings into seconds in one pass.
+
+    Returns float64 seconds with NaN where the value is empty or malformed,
+    the same values ``pd.to_timedelta(..., errors='coerce')`` gives. The
+    rare values in other formats pandas reads as durations ('1 day',
+    '1:02:03.5') are handed to ``pd.to_timedelta`` one by one.
+    """
+    text = pa.array(values, type=pa.string(), from_pandas=True)
+    matched = pc.fill_null(pc.match_substring_regex(text, _HMS), False)
+    # Unmatched rows are parsed as zero and masked out again below
+    parts = pc.extract_regex(pc.if_else(matched, text, '0:0:0'), _HMS)
+
+    def field(name):
+        return pc.cast(parts.field(name), pa.int64())
+
+    total = pc.add(pc.add(pc.multiply(field('hours'), 3600), pc.multiply(field('minutes'), 60)), field('seconds'))
+    total = pc.if_else(pc.equal(parts.field('sign'), '-'), pc.negate(total), total)
+    total = pc.if_else(matched, total, pa.scalar(None, pa.int64()))
+    seconds = pd.Series(total.to_numpy(zero_copy_only=False), index=values.index, dtype='float64')
+    other = pc.and_(pc.is_valid(text), pc.invert(matched)).to_numpy(zero_copy_only=False)
+    if other.any():
+        seconds[other] = pd.to_timedelta(values[other], errors='coerce').dt.total_seconds().to_numpy()
+    return seconds
+
+
+def duration_columns(values):
+    """Return ``(seconds, timedelta)`` columns for one duration column.
+
+    Seconds are int32 (fractions dropped) with 0 where the value is
+    malformed; the timedelta is NaT there, so averages over it skip those
+    rows.
+    """
+    seconds = parse_durations(values)
+    valid = seconds.notna()
+    # Built from whole nanoseconds: casting NaN seconds to a timedelta warns
+    nanoseconds = (seconds.where(valid, 0.0) * 1e9).round().astype('int64')
+    return seconds.fillna(0).astype('int32'), pd.to_timedelta(nanoseconds, unit='ns').where(valid)
+
+
+def seconds_to_hms(seconds):
+    if np.isnan(seconds):
+        return "00:00:00"
+    sign = "-" if seconds < 0 else ""
+    seconds = abs(seconds)
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    seconds = int(seconds % 60)
+    return f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _two_digits(values):
+    return pc.utf8_lpad(pc.cast(pa.array(values), pa.string()), 2, '0')
+
+
+def format_hms(seconds):
+    """Vectorized ``seconds_to_hms``: a Series of seconds to ``[-]HH:MM:SS``.
+
+    NaN formats as ``00:00:00`` and negative values keep their sign, exactly
+    as the scalar version does.
+    """
+    values = seconds.to_numpy(dtype='float64', na_value=np.nan)
+    negative = values < 0
+    total = np.abs(np.nan_to_num(values, nan=0.0))
+    hours = (total // 3600).astype(np.int64)
+    minutes = ((total % 3600) // 60).astype(np.int64)
+    secs = (total % 60).astype(np.int64)
+    text = pc.binary_join_element_wise(_two_digits(hours), _two_digits(minutes), _two_digits(secs), ':')
+    text = pc.if_else(pa.array(negative), pc.binary_join_element_wise('-', text, ''), text)
+    return pd.Series(text.to_numpy(zero_copy_only=False), index=seconds.index, dtype=object)
+
+
+def format_minutes_hms(minutes):
+    """Vectorized ``minutes_to_hms``: whole minutes as ``HH:MM:00``."""
+    return format_hms(np.floor(minutes) * 60)
@@ -0,0 +1,206 @@
+"""On-demand "Show Data" sections and data downloads for the pages.
+
+``st.expander`` runs its body on every rerun, open or not, and
+``st.download_button`` needs its payload up front. So every hidden table
+used to be built, and every CSV serialized, on every rerun, for sections
+most users never open. A page section is now a toggle whose body only
+runs while it is on. A CSV payload is serialized at most once per page
+view and snapshot, shared by every session, in a small byte-bounded cache.
+
+The filtered case rows themselves can be exported as CSV, Parquet or Arrow
+IPC. These files are written to disk in row chunks and never as one
+in-memory string of the frame. Each one is written once per view and
+snapshot and reused by every session of the process. Streamlit 1.36 can
+only serve a download from memory, so a file is read in to be served only
+when someone asks for it with "Prepare export".
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import streamlit as st
+
+from srr.panels import PanelCache
+from srr.schema import DISPLAY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+SHOW_DATA_LABEL = ':blue[Show Data]'
+# Upper bound on the memory held by serialized download payloads
+EXPORT_CACHE_BYTES = 64 * 1024 * 1024
+
+EXPORT_DIR = Path(__file__).resolve().parent.parent / '.srr_cache' / 'exports'
+# Rows converted and written at a time; bounds the memory of an export
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+class Export:
+    """A serialized download payload, sized for ``PanelCache``."""
+
+    def __init__(self, data):
+        self.data = data
+        self.nbytes = len(data)
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache():
+    """The process-wide cache of download payloads, keyed like the panel cache."""
+    return PanelCache(EXPORT_CACHE_BYTES)
+
+
+def show_data(key, label=SHOW_DATA_LABEL):
+    """Toggle standing in for a "Show Data" expander; True while it is open.
+
+    Build the section's table under ``if show_data(...)`` so it is only
+    computed while someone is looking at it.
+    """
+    return st.toggle(label, key=f'srr_show_{key}')
+
+
+def download_csv(view, file_name, build, help=None):
+    """Download button for the table ``build()`` returns, as CSV.
+
+    ``build`` is only called the first time this file is requested for the
+    view; later reruns and other sessions reuse the payload.
+    """
+    export = get_export_cache().get(
+        view.key + (file_name,),
+        lambda: Export(csv_bytes(build())),
+    )
+    st.download_button(':green[Download Data]', export.data, file_name=file_name, mime='text/csv', help=help)
+
+
+def _chunks(frame, columns, rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(frame), rows):
+        yield frame.iloc[start:start + rows][columns]
+
+
+def _arrow_schema(frame, columns):
+    # Inferred from every row, so a column that is empty in the first chunk
+    # still gets its real type; one column at a time to avoid copying them all
+    return pa.schema([
+        pa.Schema.from_pandas(frame[[col]], preserve_index=False).field(col)
+        for col in columns
+    ])
+
+
+def write_csv(frame, path, columns=DISPLAY_COLUMNS):
+    """Write ``frame``'s ``columns`` to ``path`` as CSV, one chunk at a time."""
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        for i, chunk in enumerate(_chunks(frame, columns)):
+            chunk.to_csv(out, index=False, header=i == 0)
+        if not len(frame):
+            frame[columns].to_csv(out, index=False)
+
+
+def write_parquet(frame, path, columns=DISPLAY_COLUMNS):
+    """Write ``frame``'s ``columns`` to ``path`` as Parquet, a row group per chunk."""
+    schema = _arrow_schema(frame, columns)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(frame, columns):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_arrow(frame, path, columns=DISPLAY_COLUMNS):
+    """Write ``frame``'s ``columns`` to ``path`` as an Arrow IPC file, a batch per chunk."""
+    schema = _arrow_schema(frame, columns)
+    with pa.OSFile(str(path), 'wb') as sink, ipc.new_file(sink, schema) as writer:
+        for chunk in _chunks(frame, columns):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+# Format label -> (file extension, MIME type, writer)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv', write_csv),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', write_parquet),
+    'Arrow IPC': ('arrow', 'application/vnd.apache.arrow.file', write_arrow),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_export_dir():
+    """This process's export directory, with every earlier process's exports removed.
+
+    Snapshot versions start again at 1 in every process (and whenever the
+    caches are cleared), so an export written under the same version by an
+    earlier one may hold other data and must never be served.
+    """
+    shutil.rmtree(EXPORT_DIR, ignore_errors=True)
+    directory = EXPORT_DIR / uuid.uuid4().hex[:12]
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def export_path(view, fmt, directory=None):
+    """The case export of ``view`` in ``fmt``, written on first use.
+
+    Files are named by snapshot version and view, so every session asking
+    for the same export gets the same file. Files of older snapshots are
+    removed when a newer one is written. ``directory`` defaults to
+    ``get_export_dir()``.
+    """
+    if directory is None:
+        directory = get_export_dir()
+    extension, _, write = EXPORT_FORMATS[fmt]
+    version = view.key[0]
+    # Segment, Service and Month pick the rows; the delta range does not
+    digest = hashlib.sha1(repr(view.key[1:4]).encode('utf-8')).hexdigest()[:16]
+    path = Path(directory) / f'v{version}-{digest}.{extension}'
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written next to the target and renamed into place, so a concurrent
+    # reader never sees a partial file
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(view.frame, tmp_name)
+        os.replace(tmp_name, path)
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+    _remove_older(path.parent, version)
+    return path
+
+
+def _remove_older(directory, version):
+    for old in directory.glob('v*-*.*'):
+        stem = old.name.split('-', 1)[0]
+        if stem[1:].isdigit() and int(stem[1:]) < version:
+            try:
+                old.unlink()
+            except OSError:
+                # Another session may be removing it too
+                logger.debug("Could not remove old export %s", old, exc_info=True)
+
+
+def download_cases(view, file_stem):
+    """Format picker and, on request, a download button for the view's filtered case rows.
+
+    ``st.download_button`` reads its whole payload into memory and hashes it
+    in every rerun that draws it. The button is therefore only drawn in the
+    rerun right after "Prepare export" is pressed, and is gone again on the
+    next one.
+    """
+    fmt = st.radio('Format', list(EXPORT_FORMATS), horizontal=True, key=f'srr_export_format_{file_stem}')
+    extension, mime, _ = EXPORT_FORMATS[fmt]
+    rows = f"{len(view.frame):,} filtered cases"
+    if not st.button('Prepare export', key=f'srr_export_prepare_{file_stem}', help=f"Write the {rows} as {fmt}"):
+        return
+    path = export_path(view, fmt)
+    with open(path, 'rb') as data:
+        st.download_button(
+            ':green[Download Data]', data, file_name=f'{file_stem}.{extension}', mime=mime,
+            help=f"Download the {rows} in {fmt} format",
+        )
@@ -0,0 +1,72 @@
+"""Row-position index behind the pages' Service / Month / segment filters."""
+import numpy as np
+
+# 'Working Hours?' value each page segment keeps (None keeps every row)
+SEGMENTS = {
+    'all': None,
+    'working': 'Yes',
+    'off': 'No',
+}
+
+# Columns the index is keyed on, in key order
+FILTER_COLUMNS = ('Service', 'Month', 'Working Hours?')
+
+
+class FilterIndex:
+    """Row positions of every (Service, Month, Working Hours?) combination.
+
+    Built once per snapshot from the categorical codes of the key columns,
+    so a filter change takes only the matching rows instead of comparing
+    every row again. Positions within a group are in frame order, and a
+    selection spanning several groups is put back in frame order, so the
+    result is the same frame a boolean mask would give.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        columns = [frame[col] for col in FILTER_COLUMNS]
+        # Shift codes by one so missing values (-1) get a group of their own
+        codes = [col.cat.codes.to_numpy(dtype=np.int64) + 1 for col in columns]
+        sizes = [len(col.cat.categories) + 1 for col in columns]
+        keys = np.ravel_multi_index(codes, sizes) if len(frame) else np.empty(0, dtype=np.int64)
+        order = np.argsort(keys, kind='stable')
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        self._groups = {}
+        for key, start, end in zip(unique_keys, starts, ends):
+            group_codes = np.unravel_index(key, sizes)
+            group = tuple(
+                None if code == 0 else col.cat.categories[code - 1]
+                for col, code in zip(columns, group_codes)
+            )
+            self._groups[group] = order[start:end]
+
+    def _matching(self, segment, service, month):
+        wanted = (service, month, SEGMENTS[segment])
+        for group, positions in self._groups.items():
+            if all(want is None or want == value for want, value in zip(wanted, group)):
+                yield group, positions
+
+    def select(self, segment='all', service=None, month=None):
+        """Rows of the segment with the given Service and Month (None = any)."""
+        if service is None and month is None and SEGMENTS[segment] is None:
+            return self.frame
+        parts = [positions for _, positions in self._matching(segment, service, month)]
+        if not parts:
+            return self.frame.iloc[:0]
+        positions = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+        return self.frame.iloc[positions]
+
+    def values(self, column, segment='all', service=None, month=None):
+        """Distinct values of a key column among the selected rows.
+
+        Values are in order of first appearance, as ``Series.unique`` gives
+        them; missing values are left out.
+        """
+        i = FILTER_COLUMNS.index(column)
+        first_rows = {}
+        for group, positions in self._matching(segment, service, month):
+            value = group[i]
+            if value is not None:
+                first_rows[value] = min(first_rows.get(value, positions[0]), positions[0])
+        return sorted(first_rows, key=first_rows.get)
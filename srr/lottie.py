@@ -0,0 +1,143 @@
+"""Lottie animations used by the pages, cached on disk and in memory.
+
+Animations are read from a local cache; only ones missing from it are
+downloaded, all at once and with a strict timeout. A page never waits on
+lottie.host for longer than ``LOTTIE_TIMEOUT`` (once per server process),
+and an animation that could not be loaded is simply not shown. Its
+download is retried in the background, at most every
+``LOTTIE_RETRY_SECONDS``, so it appears once lottie.host answers again.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+
+import requests
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+logger = logging.getLogger(__name__)
+
+LOTTIE_URLS = {
+    'people': "https://lottie.host/2ad92c27-a3c0-47cc-8882-9eb531ee1e0c/A9tbMxONxp.json",
+    'clap': "https://lottie.host/af0a6ccc-a8ac-4921-8564-5769d8e09d1e/4Czx1gna6U.json",
+    'queuing': "https://lottie.host/910429d2-a0a4-4668-a4d4-ee831f9ccecd/yOKbdL2Yze.json",
+    'inprogress': "https://lottie.host/c5c6caea-922b-4b4e-b34a-41ecaafe2a13/mphMkSfOkR.json",
+    'chill': "https://lottie.host/2acdde4d-32d7-44a8-aa64-03e1aa191466/8EG5a8ToOQ.json",
+}
+LOTTIE_DIR = Path(__file__).resolve().parent.parent / '.srr_cache' / 'lottie'
+# Bump to ignore previously cached files
+LOTTIE_CACHE_VERSION = 1
+LOTTIE_TIMEOUT = 3  # seconds
+# Wait before downloading an animation again after a failed attempt
+LOTTIE_RETRY_SECONDS = 300
+
+
+def _cache_path(url):
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    return LOTTIE_DIR / f'v{LOTTIE_CACHE_VERSION}-{digest}.json'
+
+
+def _read_cached(url):
+    try:
+        return json.loads(_cache_path(url).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _download(url):
+    r = requests.get(url, timeout=LOTTIE_TIMEOUT)
+    if r.status_code != 200:
+        return None
+    data = r.json()
+    path = _cache_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(data), encoding='utf-8')
+    os.replace(tmp_path, path)
+    return data
+
+
+class Animations:
+    """Animation JSON by name, downloading the missing ones in the background.
+
+    Shared by every session. Downloads that outlive the timeout keep running
+    and fill in the animation (and the disk cache) when they finish.
+    """
+
+    def __init__(self):
+        self._animations = {name: _read_cached(url) for name, url in LOTTIE_URLS.items()}
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._tried_at = {}
+
+    @property
+    def missing(self):
+        """Names of the animations not loaded yet."""
+        return [name for name, animation in self._animations.items() if animation is None]
+
+    def get(self, name):
+        """The animation, or None while it is missing (starting a retry when due)."""
+        animation = self._animations.get(name)
+        if animation is None and name in LOTTIE_URLS:
+            self.download([name])
+        return animation
+
+    def download(self, names, timeout=0):
+        """Start downloading ``names`` and wait up to ``timeout`` seconds for them.
+
+        An animation is skipped while its download is running or if it was
+        last tried less than ``LOTTIE_RETRY_SECONDS`` ago.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                name for name in names
+                if not (name in self._futures and not self._futures[name].done())
+                and now - self._tried_at.get(name, -LOTTIE_RETRY_SECONDS) >= LOTTIE_RETRY_SECONDS
+            ]
+            if not due:
+                return
+            pool = ThreadPoolExecutor(max_workers=len(due), thread_name_prefix='lottie')
+            for name in due:
+                self._tried_at[name] = now
+                future = pool.submit(_download, LOTTIE_URLS[name])
+                future.add_done_callback(partial(self._store, name))
+                self._futures[name] = future
+            futures = [self._futures[name] for name in due]
+        pool.shutdown(wait=False)
+        if timeout:
+            wait(futures, timeout=timeout)
+
+    def _store(self, name, future):
+        try:
+            data = future.result()
+        except (requests.RequestException, ValueError, OSError):
+            logger.warning("Could not download Lottie animation %r", name, exc_info=True)
+            return
+        if data is not None:
+            self._animations[name] = data
+
+
+@st.cache_resource(show_spinner=False)
+def load_animations():
+    """Return the ``Animations`` shared by every session.
+
+    Animations missing from the disk cache are downloaded at once; the first
+    call waits up to ``LOTTIE_TIMEOUT`` for them.
+    """
+    animations = Animations()
+    animations.download(animations.missing, timeout=LOTTIE_TIMEOUT)
+    return animations
+
+
+def show_lottie(name, **kwargs):
+    """Render the named animation, or nothing if it is not available."""
+    animation = load_animations().get(name)
+    if animation is not None:
+        st_lottie(animation, **kwargs)
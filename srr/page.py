@@ -0,0 +1,324 @@
+"""The SRR dashboard page, shared by every segment's page script.
+
+The Raw SRR Data, Working Hours and Off Hours pages draw the same dashboard
+over a different segment of the same snapshot. Each page script is one
+``render_page`` call, so they all read the same cached snapshot, panel
+results and charts, and a change to the dashboard lands once.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+from srr.charts import (
+    SERVICE_COLORS,
+    case_reason_hour_figure,
+    case_reason_pie_figure,
+    hourly_on_it_figure,
+    hourly_service_figure,
+    monthly_times_spec,
+    service_count_figure,
+    service_times_spec,
+    show_spec,
+    sme_attended_spec,
+    sme_on_it_spec,
+    sme_service_figure,
+)
+from srr.durations import format_hms, format_minutes_hms, seconds_to_hms
+from srr.exports import download_cases, download_csv, show_data
+from srr.lottie import show_lottie
+from srr.panels import load_panels
+from srr.refresh import auto_refresh
+from srr.schema import DISPLAY_COLUMNS, MONTH_ORDER
+from srr.snapshot import clear_snapshot, load_snapshot, timezone
+from srr.timing import log_rerun, rerun_timings, show_timings, span
+
+# Segment -> how its page looks
+PAGES = {
+    'all': {
+        'title': "Raw SRR Data",
+        'icon': ":mag_right:",
+        'heading': None,
+        'default_current_month': False,
+        'hide_menu': False,
+        'export_name': 'srr_cases',
+    },
+    'working': {
+        'title': "Working Hours (M-F, 5am-4PM)",
+        'icon': ":city_sunrise:",
+        'heading': "Working Hours (M-F, 5am - 4 pm)",
+        'default_current_month': True,
+        'hide_menu': True,
+        'export_name': 'srr_working_hours_cases',
+    },
+    'off': {
+        'title': "Off Hours",
+        'icon': ":city_sunset:",
+        'heading': "Off Hours",
+        'default_current_month': True,
+        'hide_menu': True,
+        'export_name': 'srr_off_hours_cases',
+    },
+}
+
+_HIDE_MENU_STYLE = """
+        <style>
+        #MainMenu {visibility: hidden;}
+        footer {visibility: hidden;}
+        header {visibility: hidden;}
+        </style>
+        """
+
+
+def _numbered(df):
+    """``df`` numbered from 1, for display."""
+    df = df.reset_index(drop=True)
+    df.index = df.index + 1
+    return df
+
+
+def render_page(segment):
+    """Draw the dashboard for one segment (a key of ``SEGMENTS``)."""
+    page = PAGES[segment]
+    st.set_page_config(page_title=page['title'], page_icon=page['icon'], layout="wide", menu_items={'Get help': 'mailto: mcgee.acebedo@five9.com'})
+    if page['hide_menu']:
+        st.markdown(_HIDE_MENU_STYLE, unsafe_allow_html=True)
+
+    with rerun_timings(segment) as timings:
+        with span('snapshot'):
+            snapshot = load_snapshot()
+
+        col1, col2 = st.columns([3, .350])
+        with col2:
+            if st.button(':red[Refresh Data]'):
+                clear_snapshot()
+                st.rerun()
+
+        st.markdown("<h1 style='text-align: center;'>Five9 SRR Management View</h1>", unsafe_allow_html=True)
+        if page['heading']:
+            st.markdown(f"<h2 style='text-align: center;'>{page['heading']}</h2>", unsafe_allow_html=True)
+
+        with span('filters'):
+            view = _filters(snapshot, segment, page)
+
+        st.write(':wave: Welcome:exclamation:')
+
+        with span('metrics'):
+            _metrics(view)
+        with span('open_cases'):
+            _open_cases(view)
+
+        st.title('Data')
+        if show_data('cases'):
+            with span('cases'):
+                st.dataframe(_numbered(view.frame[DISPLAY_COLUMNS]), use_container_width=True)
+                download_cases(view, page['export_name'])
+
+        panels = view.aggregates
+        with span('hourly'):
+            _hourly(view, panels)
+        with span('times'):
+            _times(view, panels)
+        with span('requestors'):
+            _requestors(view, panels)
+        st.divider()
+        with span('sme_summary'):
+            _sme_summary(panels)
+
+        auto_refresh()
+
+    if timings is not None:
+        _, _, service, month, _, _ = view.key
+        log_rerun(timings.record(snapshot_version=snapshot.version, service=service, month=month,
+                                 rows=len(view.frame), ingest=snapshot.timings))
+        show_timings(timings, snapshot)
+
+
+def _filters(snapshot, segment, page):
+    """Draw the Service / Month / delta range pickers; returns the view's results."""
+    cols1, cols2, cols3, cols4 = st.columns(4)
+
+    with cols1:
+        show_lottie('people', speed=1, reverse=False, loop=True, quality="low", height=200, width=200, key=None)
+
+    with cols2:
+        selected_service = st.selectbox('Service', ['All'] + snapshot.filters.values('Service', segment))
+        service = selected_service if selected_service != 'All' else None
+
+    with cols3:
+        months = snapshot.filters.values('Month', segment, service=service)
+        index = 0
+        if page['default_current_month']:
+            current_month = datetime.now(timezone).strftime('%B')
+            index = (months.index(current_month) + 1) if current_month in months else 0
+        selected_month = st.selectbox('Month', ['All'] + months, index=index)
+        month = selected_month if selected_month != 'All' else None
+
+    with cols4:
+        default_start_date = (datetime.now(timezone).replace(day=1) - timedelta(days=1)).replace(day=1)
+        default_end_date = datetime.now(timezone).replace(day=1) - timedelta(days=1)
+
+        date_range = st.date_input("Select Delta Range", value=(default_start_date, default_end_date))
+        start_date, end_date = date_range[0], date_range[1]
+
+        start_date = timezone.localize(datetime.combine(start_date, datetime.min.time()))
+        end_date = timezone.localize(datetime.combine(end_date, datetime.max.time()))
+
+    return load_panels(snapshot, segment, service, month, start_date, end_date)
+
+
+def _delta(overall, in_range):
+    return seconds_to_hms(overall - in_range if not np.isnan(in_range) else 0)
+
+
+def _metrics(view):
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric(label="Interactions", value=view.interactions)
+    with col2:
+        st.metric(label="Survey Avg.", value=f"{view.survey_avg:.2f}")
+    with col3:
+        st.metric(label="Answered Surveys", value=view.survey_count)
+    with col4:
+        st.metric("Overall Avg. TimeTo: On It", seconds_to_hms(view.avg_on_it_sec),
+                  delta=_delta(view.avg_on_it_sec, view.range_avg_on_it_sec), delta_color="inverse")
+    with col5:
+        st.metric("Overall Avg. TimeTo: Attended", seconds_to_hms(view.avg_attended_sec),
+                  delta=_delta(view.avg_attended_sec, view.range_avg_attended_sec), delta_color="inverse")
+
+
+def _open_cases(view):
+    # (title, table, section key, column widths, animation when empty / not)
+    sections = [
+        ('In Queue', view.in_queue, 'in_queue', [0.3, 1.2], 'clap', 'queuing'),
+        ('In Progress', view.in_progress, 'in_progress', [0.4, 1.2], 'chill', 'inprogress'),
+    ]
+    for title, table, key, widths, empty_animation, busy_animation in sections:
+        col1, col2 = st.columns(widths)
+        with col1:
+            st.title(f'{title} ({len(table)})')
+        with col2:
+            show_lottie(busy_animation if len(table) else empty_animation, speed=1, height=100, width=200)
+        if show_data(key):
+            st.dataframe(table, use_container_width=True)
+
+
+def _hourly(view, panels):
+    col1, col2 = st.columns(2)
+
+    with col1:
+        agg_hour_service = panels.hour_service.copy()
+        agg_hour_service['Total'] = agg_hour_service.iloc[:, 1:].sum(axis=1)
+        st.plotly_chart(hourly_service_figure(agg_hour_service, SERVICE_COLORS), use_container_width=True)
+        if show_data('hour_service'):
+            st.dataframe(_numbered(agg_hour_service), use_container_width=True)
+            download_csv(view, 'hourly_interactions_by_service.csv', lambda: agg_hour_service, help="Click to download the Hourly Interactions by Service in CSV format")
+
+    with col2:
+        agg_hour_on_it = panels.hour_on_it.copy()
+        agg_hour_on_it['TimeTo: On It Minutes'] = agg_hour_on_it['TimeTo: On It Sec'] / 60
+        st.plotly_chart(hourly_on_it_figure(agg_hour_on_it), use_container_width=True)
+        agg_hour_on_it['TimeTo: On It HH:MM:SS'] = format_minutes_hms(agg_hour_on_it['TimeTo: On It Minutes'])
+        if show_data('hour_on_it'):
+            st.dataframe(_numbered(agg_hour_on_it[['Hour_Created', 'TimeTo: On It HH:MM:SS']]), use_container_width=True)
+            download_csv(view, 'average_time_to_on_it.csv', lambda: agg_hour_on_it, help="Click to download the Average Time to On It by Hour in CSV format")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(case_reason_hour_figure(panels.hour_case_reason), use_container_width=True)
+    with col2:
+        st.plotly_chart(case_reason_pie_figure(panels.case_reason_counts))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        _case_reason_times(panels, 'TimeTo: Attended')
+    with col2:
+        _case_reason_times(panels, 'TimeTo: On It')
+
+
+def _case_reason_times(panels, measure):
+    table = panels.case_reason_times[['Case Reason', f'{measure} Sec']].sort_values(by=f'{measure} Sec', ascending=False)
+    table[f'Avg {measure}'] = format_hms(table[f'{measure} Sec'])
+    st.subheader(f'Average {measure} by Case Reason')
+    st.dataframe(_numbered(table[['Case Reason', f'Avg {measure}']]), use_container_width=True)
+
+
+def _minutes(table, key):
+    """``table``'s mean seconds as minutes: the long form for charts, and HH:MM:SS columns."""
+    table['TimeTo_On_It_Minutes'] = table['TimeTo: On It Sec'] / 60
+    table['TimeTo_Attended_Minutes'] = table['TimeTo: Attended Sec'] / 60
+    long = table.melt(id_vars=[key], value_vars=['TimeTo_On_It_Minutes', 'TimeTo_Attended_Minutes'], var_name='Category', value_name='Minutes')
+    table['TimeTo_On_It_HH:MM:SS'] = format_minutes_hms(table['TimeTo_On_It_Minutes'])
+    table['TimeTo_Attended_HH:MM:SS'] = format_minutes_hms(table['TimeTo_Attended_Minutes'])
+    return long
+
+
+def _times(view, panels):
+    col1, col5 = st.columns(2)
+    columns = ['TimeTo_On_It_HH:MM:SS', 'TimeTo_Attended_HH:MM:SS']
+
+    agg_month = panels.month_times.copy()
+    agg_month_long = _minutes(agg_month, 'Month')
+    with col1:
+        show_spec(monthly_times_spec(agg_month_long, MONTH_ORDER))
+        if show_data('month_times'):
+            agg_month = agg_month[agg_month['Month'].isin(MONTH_ORDER)].copy()
+            agg_month['Month'] = pd.Categorical(agg_month['Month'], categories=MONTH_ORDER, ordered=True)
+            agg_month_sorted = _numbered(agg_month.sort_values('Month'))[['Month'] + columns]
+            st.dataframe(agg_month_sorted, use_container_width=True)
+            download_csv(view, 'monthly_response_times.csv', lambda: agg_month_sorted, help="Click to download the Monthly Response Times in CSV format")
+
+    agg_service = panels.service_times.copy()
+    agg_service_long = _minutes(agg_service, 'Service')
+    with col5:
+        show_spec(service_times_spec(agg_service_long))
+        if show_data('service_times'):
+            agg_service_display = _numbered(agg_service[['Service'] + columns])
+            st.dataframe(agg_service_display, use_container_width=True)
+            download_csv(view, 'group_response_times.csv', lambda: agg_service_display, help="Click to download the Group Response Times in CSV format")
+
+    with col1:
+        st.plotly_chart(service_count_figure(panels.service_counts, SERVICE_COLORS))
+
+    with col5:
+        st.plotly_chart(sme_service_figure(panels.sme_service, SERVICE_COLORS), use_container_width=True)
+        if show_data('sme_service', 'Show Data'):
+            data_chart4 = panels.sme_service.pivot_table(index='SME', columns='Service', values='count', fill_value=0, observed=True).sort_index().reset_index()
+            data_chart4['Total'] = data_chart4.sum(axis=1)
+            st.dataframe(_numbered(data_chart4.sort_values('Total', ascending=False)), use_container_width=True)
+
+
+def _requestors(view, panels):
+    st.subheader('Interaction Count by Requestor')
+
+    # AgGrid adds a column to the frame it is given; the cached table is shared
+    pivot_df = panels.requestor_service.copy()
+
+    gb = GridOptionsBuilder.from_dataframe(pivot_df)
+    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=10)
+    gb.configure_default_column(groupable=True, value=True, enableRowGroup=True, aggFunc='sum', editable=False)
+    AgGrid(pivot_df, gridOptions=gb.build(), update_mode=GridUpdateMode.MODEL_CHANGED, fit_columns_on_grid_load=True)
+
+    download_csv(view, 'interaction_count_by_requestor.csv', lambda: pivot_df, help="Download Interaction Count by Requestor Data in CSV format")
+
+
+def _sme_summary(panels):
+    df_sorted = panels.sme_summary.copy()
+    df_sorted['Total_Avg_Sec'] = df_sorted['Avg_On_It_Sec'] + df_sorted['Avg_Attended_Sec']
+    df_sorted = df_sorted.sort_values(by=['Total_Avg_Sec', 'Number_of_Interactions', 'Avg_Survey'], ascending=[True, False, False])
+    df_sorted['Avg_On_It'] = format_hms(df_sorted['Avg_On_It_Sec'])
+    df_sorted['Avg_Attended'] = format_hms(df_sorted['Avg_Attended_Sec'])
+    df_sorted.rename(columns={'SME (On It)': 'SME'}, inplace=True)
+
+    st.subheader('SME Summary Table')
+    st.dataframe(_numbered(df_sorted[['SME', 'Avg_On_It', 'Avg_Attended', 'Number_of_Interactions', 'Avg_Survey']]), use_container_width=True)
+
+    df_sorted['Avg_On_It_Min'] = df_sorted['Avg_On_It_Sec'] / 60
+    df_sorted['Avg_Attended_Min'] = df_sorted['Avg_Attended_Sec'] / 60
+
+    st.markdown(":arrow_up: 5 minutes = :red[red]")
+
+    show_spec(sme_on_it_spec(df_sorted[['SME', 'Avg_On_It_Min']]), use_container_width=True)
+    show_spec(sme_attended_spec(df_sorted[['SME', 'Avg_Attended_Min']]), use_container_width=True)
@@ -0,0 +1,144 @@
+"""Computed panel results per page view, shared across sessions.
+
+Supervisors mostly look at the same few views, so everything a page
+computes for a (snapshot version, segment, Service, Month, delta range)
+selection is kept in a process-wide LRU cache bounded by memory. A session
+that opens a view someone else already opened gets it without any pandas
+work; pages must treat the cached tables as read-only.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+from srr.aggregates import PanelAggregates
+from srr.schema import IN_PROGRESS_COLUMNS, IN_QUEUE_COLUMNS
+from srr.snapshot import status_table
+from srr.timing import span
+
+# Upper bound on the memory held by cached panel results
+PANEL_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def _frame_bytes(frame):
+    # Shallow on purpose: sliced frames share their strings with the snapshot,
+    # so only the column arrays and pointers are new memory.
+    return int(frame.memory_usage(index=True, deep=False).sum())
+
+
+def _ratio(total, count):
+    return total / count if count else np.nan
+
+
+class PanelResults:
+    """Everything a page renders for one view of one snapshot.
+
+    Metrics and panel tables come from the snapshot's rollup cube and the
+    delta-range averages from its time index; only the case tables take
+    rows from the frame.
+    """
+
+    def __init__(self, snapshot, segment, service, month, start_date, end_date):
+        self.key = view_key(snapshot, segment, service, month, start_date, end_date)
+        filters, cube = snapshot.filters, snapshot.cube
+        with span('filter'):
+            frame = filters.select(segment, service=service, month=month)
+            self.frame = frame
+            self.in_queue = status_table(frame, 'In Queue', IN_QUEUE_COLUMNS)
+            self.in_progress = status_table(frame, 'In Progress', IN_PROGRESS_COLUMNS)
+
+        totals = cube.totals(segment, service, month)
+        self.interactions = int(totals['count'])
+        self.survey_avg = _ratio(totals['survey_sum'], totals['survey_count'])
+        self.survey_count = int(totals['survey_count'])
+        self.avg_on_it_sec = _ratio(totals['on_it_sum'], totals['on_it_valid'])
+        self.avg_attended_sec = _ratio(totals['attended_sum'], totals['attended_valid'])
+
+        # The delta range spans the whole segment, whatever Service and Month
+        in_range = snapshot.timeline.totals(segment, start_date, end_date)
+        self.range_avg_on_it_sec = _ratio(in_range['on_it_sum'], in_range['on_it_valid'])
+        self.range_avg_attended_sec = _ratio(in_range['attended_sum'], in_range['attended_valid'])
+
+        with span('aggregate'):
+            self.aggregates = PanelAggregates.from_cells(
+                *(cube.cells(name, segment, service, month) for name in ('hourly', 'sme', 'sme_on_it', 'requestor'))
+            )
+
+        tables = [self.in_queue, self.in_progress, *vars(self.aggregates).values()]
+        if frame is not snapshot.frame:
+            tables.append(frame)
+        self.nbytes = sum(_frame_bytes(table) for table in tables)
+
+
+class PanelCache:
+    """Least-recently-used cache of per-view results, bounded by total bytes.
+
+    Values are ``PanelResults`` or anything else exposing ``nbytes``.
+
+    Entries of older snapshot versions are dropped as soon as a newer
+    version is cached; nothing will ask for them again.
+    """
+
+    def __init__(self, max_bytes=PANEL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, compute):
+        """Return the results for ``key`` (version first), computing them on a miss."""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return results
+            self.misses += 1
+        # Computed outside the lock so other views are not held up
+        results = compute()
+        with self._lock:
+            self._put(key, results)
+        return results
+
+    def _put(self, key, results):
+        version = key[0]
+        if self._version is None or version > self._version:
+            self._entries.clear()
+            self.nbytes = 0
+            self._version = version
+        elif version < self._version or key in self._entries:
+            return
+        if results.nbytes > self.max_bytes:
+            return
+        self._entries[key] = results
+        self.nbytes += results.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+
+@st.cache_resource(show_spinner=False)
+def get_panel_cache():
+    """The process-wide panel cache shared by every page and session."""
+    return PanelCache()
+
+
+def view_key(snapshot, segment, service, month, start_date, end_date):
+    """Cache key of a page view; the snapshot version comes first."""
+    return (snapshot.version, segment, service, month, start_date, end_date)
+
+
+def load_panels(snapshot, segment, service, month, start_date, end_date):
+    """Return the ``PanelResults`` of a page view, computed at most once per snapshot."""
+    with span('panels'):
+        return get_panel_cache().get(
+            view_key(snapshot, segment, service, month, start_date, end_date),
+            lambda: PanelResults(snapshot, segment, service, month, start_date, end_date),
+        )
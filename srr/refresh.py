@@ -0,0 +1,73 @@
+"""Scheduled page refresh that never holds a script thread.
+
+The countdown is drawn by the browser, and a fragment checks the shared
+snapshot store every ``REFRESH_SECONDS``. The store's ingestion worker
+does the reading; the page itself reruns only once it has published a
+newer snapshot. Every poll also redraws when the data was last read, so an
+open page shows its data getting older, and says so when a refresh failed.
+"""
+from datetime import datetime
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from srr.durations import seconds_to_hms
+from srr.snapshot import REFRESH_SECONDS, SEEN_VERSION_KEY, get_store, timezone
+
+_COUNTDOWN_HTML = """
+<p id="srr-countdown" style="color:red; margin:0; font-family:'Source Sans Pro', sans-serif;"></p>
+<script>
+  // tick {tick}
+  const label = document.getElementById('srr-countdown');
+  const deadline = Date.now() + {seconds} * 1000;
+  function render() {{
+    const left = Math.max(0, Math.round((deadline - Date.now()) / 1000));
+    if (left === 0) {{
+      label.textContent = 'Refreshing...';
+      return;
+    }}
+    const mins = String(Math.floor(left / 60)).padStart(2, '0');
+    const secs = String(left % 60).padStart(2, '0');
+    label.textContent = 'Time to refresh: ' + mins + ':' + secs;
+    setTimeout(render, 1000);
+  }}
+  render();
+</script>
+"""
+
+
+def _freshness(store):
+    """Show when the snapshot was read, how long that took, and any failed refresh."""
+    snapshot = store.snapshot
+    fetched = datetime.fromtimestamp(snapshot.fetched_at, timezone)
+    st.markdown(f"**Last Updated:** {fetched.strftime('%Y-%m-%d, %H:%M:%S %Z%z')}")
+    details = f"Snapshot age: {seconds_to_hms(snapshot.age)}"
+    if snapshot.fetch_seconds is not None:
+        details += f" · fetched in {snapshot.fetch_seconds:.1f} s"
+    st.caption(details)
+    if store.last_error is not None:
+        st.warning(f"The last refresh failed ({type(store.last_error).__name__}), so this data may be out of date.", icon="⚠️")
+
+
+def _countdown(seconds):
+    # The tick changes the HTML on every poll, which restarts the countdown
+    tick = st.session_state.get('srr_refresh_tick', 0) + 1
+    st.session_state['srr_refresh_tick'] = tick
+    components.html(_COUNTDOWN_HTML.format(seconds=seconds, tick=tick), height=30)
+
+
+@st.experimental_fragment(run_every=REFRESH_SECONDS)
+def _poll_snapshot():
+    store = get_store()
+    # Only starts a refresh if the ingestion worker is not running
+    store.get()
+    if store.version != st.session_state.get(SEEN_VERSION_KEY):
+        st.rerun()
+    _freshness(store)
+    _countdown(REFRESH_SECONDS)
+
+
+def auto_refresh():
+    """Show the refresh countdown in the sidebar and rerun on new data."""
+    with st.sidebar:
+        _poll_snapshot()
@@ -0,0 +1,82 @@
+"""Declared schema of the "Response and Survey Form" worksheet.
+
+Only the columns listed here are read from the sheet, and every one of them
+is read as text so pandas never has to infer types; numeric, date and
+duration columns are converted explicitly in ``load_data``.
+"""
+
+# Source column name -> kind. 'text' columns stay strings, 'number' becomes
+# float64, 'date' becomes a tz-aware datetime, 'duration' holds H:MM:SS text.
+SHEET_SCHEMA = {
+    'Case #': 'text',
+    'Service': 'text',
+    'Inquiry': 'text',
+    'Requestor': 'text',
+    'Creation Timestamp': 'text',
+    'In process (On It SME)': 'text',
+    'On It Time': 'text',
+    'SME': 'text',
+    'Attendee': 'text',
+    'Attended Timestamp': 'text',
+    'Message Link': 'text',
+    'Message Link 0': 'text',
+    'Message Link 1': 'text',
+    'Message Link 2': 'text',
+    'Status': 'text',
+    'Case Reason': 'text',
+    'AFI': 'text',
+    'AFI Comment': 'text',
+    'Article#': 'text',
+    'TimeTo: On It': 'duration',
+    'TimeTo: Attended': 'duration',
+    'Month': 'text',
+    'Day': 'text',
+    'Weekend?': 'text',
+    'Date Created': 'date',
+    'Working Hours?': 'text',
+    'Survey': 'number',
+    'Hour_Created': 'number',
+}
+
+# Sheet headers renamed on load
+RENAMES = {'In process (On It SME)': 'SME (On It)'}
+
+NUMBER_COLUMNS = [col for col, kind in SHEET_SCHEMA.items() if kind == 'number']
+DATE_COLUMNS = [col for col, kind in SHEET_SCHEMA.items() if kind == 'date']
+DURATION_COLUMNS = [col for col, kind in SHEET_SCHEMA.items() if kind == 'duration']
+
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Low-cardinality columns stored as Categoricals, by loaded name. None orders
+# the categories alphabetically; a list fixes the order (unexpected values
+# are appended after it, sorted).
+CATEGORY_ORDERS = {
+    'Service': None,
+    'Status': None,
+    'Case Reason': None,
+    'Month': MONTH_ORDER,
+    'Day': DAY_ORDER,
+    'Weekend?': None,
+    'Working Hours?': None,
+    'SME': None,
+    'SME (On It)': None,
+    'Attendee': None,
+    'Requestor': None,
+}
+
+# Columns each part of a page needs, by their loaded (renamed) names
+IN_QUEUE_COLUMNS = ['Case #', 'Requestor', 'Service', 'Creation Timestamp', 'Message Link']
+IN_PROGRESS_COLUMNS = ['Case #', 'Requestor', 'Service', 'Creation Timestamp', 'SME (On It)', 'TimeTo: On It', 'Message Link']
+DISPLAY_COLUMNS = ['Case #', 'Service', 'Inquiry', 'Requestor', 'Creation Timestamp', 'SME (On It)', 'On It Time', 'Attendee', 'Attended Timestamp', 'Message Link', 'Message Link 0', 'Message Link 1', 'Message Link 2', 'Status', 'Case Reason', 'AFI', 'AFI Comment', 'Article#', 'TimeTo: On It (Raw)', 'TimeTo: Attended (Raw)', 'Month', 'Day', 'Weekend?', 'Date Created', 'Working Hours?', 'Survey', 'Hour_Created']
+
+
+def read_options():
+    """Keyword arguments for ``conn.read`` that project and type the sheet.
+
+    Plain lists and strings only: the connection hashes its read options.
+    """
+    return {
+        'usecols': list(SHEET_SCHEMA),
+        'dtype': {col: 'str' for col in SHEET_SCHEMA},
+    }
@@ -0,0 +1,460 @@
+"""Process-wide SRR snapshot shared by every page and session."""
+import logging
+import os
+import threading
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytz
+import streamlit as st
+
+from srr.cube import RollupCube
+from srr.durations import duration_columns
+from srr.filters import FilterIndex
+from srr.schema import CATEGORY_ORDERS, DATE_COLUMNS, DURATION_COLUMNS, NUMBER_COLUMNS, RENAMES, read_options
+from srr.sources import LocalSheetConnection, open_connection
+from srr.storage import SNAPSHOT_PATH, load_saved_snapshot, save_snapshot
+from srr.timeline import TimeIndex
+
+logger = logging.getLogger(__name__)
+
+# Set timezone to America/Los_Angeles
+timezone = pytz.timezone('America/Los_Angeles')
+
+WORKSHEET = "Response and Survey Form"
+# How often the ingestion worker polls the sheet (set SRR_REFRESH_SECONDS to change)
+REFRESH_SECONDS = int(os.environ.get('SRR_REFRESH_SECONDS', 120))
+# Wait before retrying when there is no snapshot at all yet
+RETRY_SECONDS = 10
+# Incremental refreshes re-read this many rows before the previous end of the
+# sheet, plus every row from the oldest still-open case onwards, so edits to
+# recent cases (Status, SME (On It), TimeTo:, Survey) are picked up.
+OVERLAP_ROWS = 500
+OPEN_STATUSES = ('In Queue', 'In Progress')
+# Open cases further back than this are left to the periodic full re-read
+MAX_OVERLAP_ROWS = 5000
+# Older edits are picked up by a periodic full re-read
+FULL_RELOAD_SECONDS = 3600
+
+# Session key holding the snapshot version the session last rendered
+SEEN_VERSION_KEY = 'srr_snapshot_version'
+
+# The store whose ingestion worker is running. Clearing get_store's cache
+# entry does not stop its worker, so the next store stops it first.
+_worker_store = None
+_worker_lock = threading.Lock()
+
+
+def load_data(data):
+    # Every derived column the pages use is materialized here, once per
+    # data version, so reruns only ever slice the result.
+    df = data.copy()  # Make a copy to avoid modifying the original DataFrame
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors='coerce').dt.tz_localize(timezone)
+    for col in NUMBER_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df.rename(columns=RENAMES, inplace=True)
+    df.dropna(subset=['Service'], inplace=True)
+    df['Case # Clean'] = df['Case #'].str.replace(',', '', regex=False)
+    df['TimeTo: On It (Raw)'] = df['TimeTo: On It'].copy()
+    df['TimeTo: Attended (Raw)'] = df['TimeTo: Attended'].copy()
+    for col in DURATION_COLUMNS:
+        df[f'{col} Sec'], df[f'{col} Timedelta'] = duration_columns(df[col])
+    for col, order in CATEGORY_ORDERS.items():
+        df[col] = _categorical(df[col], order)
+    return df
+
+
+def _categories(values, order):
+    if order is None:
+        return sorted(values)
+    return list(order) + sorted(set(values) - set(order))
+
+
+def _categorical(values, order):
+    return pd.Categorical(values, categories=_categories(values.dropna().unique(), order), ordered=order is not None)
+
+
+def restore_categories(frame):
+    """``frame`` with every ``CATEGORY_ORDERS`` column categorical again.
+
+    Parquet gives back a categorical column without categories (one that
+    is empty in every row) as plain objects; ``merge_frames`` needs them
+    categorical, as ``load_data`` leaves them.
+    """
+    columns = {
+        col: _categorical(frame[col], order)
+        for col, order in CATEGORY_ORDERS.items()
+        if not isinstance(frame[col].dtype, pd.CategoricalDtype)
+    }
+    return frame.assign(**columns) if columns else frame
+
+
+def merge_frames(kept, delta):
+    """Append ``delta`` to ``kept``, keeping the categorical columns categorical.
+
+    ``pd.concat`` falls back to object columns when the categories differ, so
+    both sides are first widened to the union of their categories.
+    """
+    kept_columns, delta_columns = {}, {}
+    for col, order in CATEGORY_ORDERS.items():
+        old, new = kept[col].cat.categories, delta[col].cat.categories
+        if old.equals(new):
+            continue
+        categories = _categories(old.union(new), order)
+        kept_columns[col] = kept[col].cat.set_categories(categories)
+        delta_columns[col] = delta[col].cat.set_categories(categories)
+    return pd.concat([kept.assign(**kept_columns), delta.assign(**delta_columns)])
+
+
+def same_rows(old, new):
+    """Whether ``old`` and ``new`` hold the same rows at the same sheet positions.
+
+    Categorical columns are compared by value, so two frames whose category
+    lists differ still compare equal.
+    """
+    if len(old) != len(new) or not old.index.equals(new.index) or not old.columns.equals(new.columns):
+        return False
+    if old.equals(new):
+        return True
+    return np.array_equal(
+        pd.util.hash_pandas_object(old, index=False).to_numpy(),
+        pd.util.hash_pandas_object(new, index=False).to_numpy(),
+    )
+
+
+def read_sheet(conn, skip_rows=0):
+    """Read the worksheet, skipping the first ``skip_rows`` data rows.
+
+    Only the columns declared in ``srr.schema`` are read, all as text. The
+    returned frame is indexed by sheet row position (0 = first data row),
+    which is what lets an incremental read be spliced into the cached frame.
+    """
+    options = read_options()
+    if skip_rows:
+        options['skiprows'] = range(1, skip_rows + 1)
+    data = conn.read(worksheet=WORKSHEET, ttl=0, **options)
+    data.index = pd.RangeIndex(skip_rows, skip_rows + len(data))
+    return data
+
+
+class Snapshot:
+    """One published version of the SRR frame and the indexes built on it.
+
+    Everything here belongs to the same version and is never modified, so
+    a page can use it for a whole run while newer versions are published.
+    ``fetched_at`` is when its data was read from the sheet and
+    ``fetch_seconds`` how long that read took (None if unknown). A refresh
+    that finds the sheet unchanged keeps the snapshot and only moves these
+    two forward.
+
+    ``timings`` holds the seconds each ingest stage took to make the
+    snapshot ('read', 'enrich', 'index'). Building the indexes here is
+    added to the 'index' stage passed in.
+    """
+
+    def __init__(self, frame, version, cube=None, fetched_at=None, fetch_seconds=None, timings=None):
+        started = time.perf_counter()
+        self.frame = frame
+        self.version = version
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.fetch_seconds = fetch_seconds
+        self.filters = FilterIndex(frame)
+        self.timeline = TimeIndex(frame)
+        self.cube = cube if cube is not None else RollupCube.build(frame)
+        self.timings = dict(timings or {})
+        self.timings['index'] = self.timings.get('index', 0.0) + time.perf_counter() - started
+
+    @property
+    def age(self):
+        """Seconds since the snapshot's data was read from the sheet."""
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class SnapshotStore:
+    """Normalized SRR frame kept up to date by append-only refreshes.
+
+    The sheet grows by one row per case, so after the first full read only
+    the tail (plus an overlap window of recently changed rows) is re-read
+    and merged into the cached frame. Frames are never modified after they
+    are published; a refresh builds a new one and swaps the reference.
+
+    Refreshes are single-flight: at most one runs at a time, on a worker
+    thread, and everyone who asks for one while it runs joins it. Once a
+    frame exists ``get`` never waits; a stale frame is served while the
+    refresh catches up (stale-while-revalidate).
+
+    ``start_worker`` starts the ingestion worker, which refreshes every
+    ``refresh_seconds`` on its own, so script runs only ever pick up the
+    latest published snapshot and never read the sheet themselves.
+
+    A refresh that reads back exactly the rows already held publishes
+    nothing, so the version only changes when the data does.
+
+    When ``path`` is given every published snapshot is also saved there, and
+    a failed refresh keeps serving the last snapshot instead of erroring.
+    """
+
+    def __init__(self, read, path=None, refresh_seconds=REFRESH_SECONDS):
+        self._read = read
+        self._path = path
+        self.refresh_seconds = refresh_seconds
+        # Guards starting a refresh; the refresh itself runs unlocked on the
+        # single in-flight worker.
+        self._lock = threading.Lock()
+        self._flight = None
+        self._worker = None
+        self._stopping = threading.Event()
+        self.frame = None
+        self.snapshot = None
+        self.version = 0
+        self.rows_read = 0
+        self.fetched_at = 0.0
+        self.full_read_at = 0.0
+        self.last_error = None
+
+    def is_stale(self):
+        return self.frame is None or time.time() - self.fetched_at >= self.refresh_seconds
+
+    def is_refreshing(self):
+        return self._flight is not None and self._flight.is_alive()
+
+    def has_worker(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def get(self):
+        """Return the current frame; only the very first load waits for the sheet."""
+        if self.frame is None:
+            self.refresh()
+        elif self.is_stale() and not self.has_worker():
+            self.refresh_in_background()
+        return self.frame
+
+    def start_worker(self):
+        """Start the ingestion worker unless it is running; returns its thread."""
+        with self._lock:
+            if not self.has_worker():
+                self._stopping.clear()
+                self._worker = threading.Thread(target=self._poll, name='srr-ingest', daemon=True)
+                self._worker.start()
+            return self._worker
+
+    def stop_worker(self, timeout=None):
+        """Stop the ingestion worker after its current refresh, if any."""
+        self._stopping.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _poll(self):
+        while not self._stopping.is_set():
+            self.refresh_in_background().join()
+            if self.frame is None:
+                wait = RETRY_SECONDS
+            else:
+                wait = self.fetched_at + self.refresh_seconds - time.time()
+            self._stopping.wait(max(wait, 0.0))
+
+    def restore(self):
+        """Load the last saved snapshot; returns True if there was one."""
+        if self._path is None:
+            return False
+        saved = load_saved_snapshot(self._path)
+        if saved is None:
+            return False
+        frame, stamp = saved
+        frame = restore_categories(frame)
+        with self._lock:
+            self.frame = frame
+            self.snapshot = Snapshot(
+                frame, stamp['version'],
+                fetched_at=stamp['fetched_at'], fetch_seconds=stamp.get('fetch_seconds'),
+            )
+            self.version = stamp['version']
+            self.rows_read = stamp['rows_read']
+            self.fetched_at = stamp['fetched_at']
+            self.full_read_at = stamp['full_read_at']
+        return True
+
+    def refresh_in_background(self, full=False):
+        """Start a refresh unless one is in flight; returns the worker thread.
+
+        ``full`` forces the next refresh to re-read the whole sheet. If a
+        refresh is already running it is returned as is rather than queuing
+        another one behind it.
+        """
+        with self._lock:
+            if not self.is_refreshing():
+                if full:
+                    self.fetched_at = 0.0
+                    self.full_read_at = 0.0
+                self._flight = threading.Thread(target=self._run_flight, name='srr-refresh', daemon=True)
+                self._flight.start()
+            return self._flight
+
+    def refresh(self, full=False):
+        """Refresh (or join the refresh in flight) and wait for it to finish."""
+        self.refresh_in_background(full).join()
+        if self.frame is None:
+            raise self.last_error
+
+    def _run_flight(self):
+        if not self.is_stale():
+            return
+        try:
+            self._try_refresh()
+        except Exception as exc:
+            # Nothing to fall back to; ``refresh`` re-raises it to the caller
+            self.last_error = exc
+
+    def _try_refresh(self):
+        try:
+            self._refresh()
+        except Exception as exc:
+            if self.frame is None:
+                raise
+            # Sheets is unreachable or rate-limited: keep the last snapshot
+            # and try again after the next refresh interval.
+            logger.warning("SRR refresh failed; serving snapshot version %s", self.version, exc_info=True)
+            self.last_error = exc
+            self.fetched_at = time.time()
+            return
+        self.last_error = None
+
+    def _refresh(self):
+        now = time.time()
+        if self.frame is None or now - self.full_read_at >= FULL_RELOAD_SECONDS:
+            self._full_refresh(now)
+            return
+
+        start = self._overlap_start()
+        data, fetch_seconds = self._timed_read(start)
+        if start + len(data) < self.rows_read:
+            # Rows were removed from the sheet; the positions no longer line up
+            self._full_refresh(now)
+            return
+        replaced = self.frame.index >= start
+        started = time.perf_counter()
+        delta = load_data(data)
+        if same_rows(self.frame.loc[replaced], delta):
+            self._keep(start + len(data), now, fetch_seconds)
+            return
+        frame = merge_frames(self.frame.loc[~replaced], delta)
+        enriched = time.perf_counter()
+        # The replaced rows come out of the cube and the re-read ones go in
+        cube = self.snapshot.cube.updated(self.frame.loc[replaced], delta, frame)
+        timings = {'read': fetch_seconds, 'enrich': enriched - started, 'index': time.perf_counter() - enriched}
+        self._publish(frame, start + len(data), now, timings, cube)
+
+    def _full_refresh(self, now):
+        data, fetch_seconds = self._timed_read()
+        self.full_read_at = now
+        started = time.perf_counter()
+        frame = load_data(data)
+        if self.frame is not None and same_rows(self.frame, frame):
+            self._keep(len(data), now, fetch_seconds)
+            return
+        self._publish(frame, len(data), now, {'read': fetch_seconds, 'enrich': time.perf_counter() - started})
+
+    def _timed_read(self, *args):
+        started = time.perf_counter()
+        data = self._read(*args)
+        return data, time.perf_counter() - started
+
+    def _overlap_start(self):
+        start = max(0, self.rows_read - OVERLAP_ROWS)
+        open_rows = self.frame.index[self.frame['Status'].isin(OPEN_STATUSES)]
+        if len(open_rows):
+            start = min(start, int(open_rows.min()))
+        return max(start, self.rows_read - MAX_OVERLAP_ROWS, 0)
+
+    def _keep(self, rows_read, now, fetch_seconds):
+        # Nothing changed: the published snapshot (and every cache keyed on
+        # its version) stays, it is only marked as read again
+        self.rows_read = rows_read
+        self.fetched_at = now
+        self.snapshot.fetched_at = now
+        self.snapshot.fetch_seconds = fetch_seconds
+
+    def _publish(self, frame, rows_read, now, timings, cube=None):
+        snapshot = Snapshot(
+            frame, self.version + 1, cube,
+            fetched_at=now, fetch_seconds=timings['read'], timings=timings,
+        )
+        self.frame = frame
+        self.snapshot = snapshot
+        self.rows_read = rows_read
+        self.fetched_at = now
+        self.version += 1
+        if self._path is not None:
+            self._save()
+
+    def _save(self):
+        stamp = {
+            'version': self.version,
+            'rows_read': self.rows_read,
+            'fetched_at': self.fetched_at,
+            'full_read_at': self.full_read_at,
+            'fetch_seconds': self.snapshot.fetch_seconds,
+        }
+        try:
+            save_snapshot(self.frame, stamp, self._path)
+        except Exception:
+            # The on-disk copy is a convenience; never fail a refresh over it
+            logger.warning("Could not save SRR snapshot to %s", self._path, exc_info=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    """The process-wide snapshot store shared by every page and session."""
+    conn = open_connection()
+    # A local sheet file is its own saved copy; keeping it out of the saved
+    # snapshot also keeps it from being mixed with live sheet data
+    path = None if isinstance(conn, LocalSheetConnection) else SNAPSHOT_PATH
+    store = SnapshotStore(partial(read_sheet, conn), path=path)
+    # A saved snapshot is served right away while the worker catches up
+    store.restore()
+    global _worker_store
+    with _worker_lock:
+        if _worker_store is not None:
+            # Exits once its refresh in flight, if any, is done
+            _worker_store.stop_worker(timeout=0)
+        store.start_worker()
+        _worker_store = store
+    return store
+
+
+def load_snapshot():
+    """Return the current ``Snapshot``, shared by every page and session.
+
+    Its frame is shared, so callers must copy it before modifying it. The
+    version is remembered for the session so ``auto_refresh`` can tell when
+    a newer snapshot is available.
+    """
+    store = get_store()
+    if store.frame is None:
+        with st.spinner('Loading SRR data...'):
+            store.get()
+    else:
+        store.get()
+    snapshot = store.snapshot
+    st.session_state[SEEN_VERSION_KEY] = snapshot.version
+    return snapshot
+
+
+def clear_snapshot():
+    """Re-read the whole sheet now and wait for it.
+
+    Only the SRR snapshot is refreshed; other cached data is left alone. If
+    a refresh is already in flight (another session pressed the button, or
+    the scheduled one is running) this joins it instead of starting another.
+    """
+    with st.spinner('Refreshing SRR data...'):
+        get_store().refresh(full=True)
+
+
+def status_table(df, status, columns):
+    """Cases of ``df`` in ``status``, showing the comma-free case number."""
+    rows = df.loc[df['Status'] == status]
+    return rows[columns].assign(**{'Case #': rows['Case # Clean']})
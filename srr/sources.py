@@ -0,0 +1,77 @@
+"""Where the SRR worksheet is read from.
+
+The pages read the "Response and Survey Form" worksheet through a Streamlit
+connection with ``GSheetsConnection.read``'s signature. By default that is
+the live Google Sheet. When ``SRR_DATA_SOURCE`` names a local CSV or Parquet
+file, such as one written by ``srr.synthetic``, the worksheet is served from
+that file instead. The dashboards can then be run and measured without
+Google Sheets credentials.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import streamlit as st
+from streamlit.connections import BaseConnection
+
+# Path of a local CSV or Parquet file to serve the worksheet from
+DATA_SOURCE_ENV = 'SRR_DATA_SOURCE'
+
+
+def read_fixture(path, usecols=None, dtype=None, skiprows=None, **options):
+    """Read a local sheet file the way ``conn.read`` reads the worksheet.
+
+    Takes the ``read_options`` of ``srr.schema`` plus ``skiprows``, as
+    ``pd.read_csv`` does. A Parquet file gives the same frame as the CSV
+    would: ``skiprows`` counts lines, with the header as line 0, and columns
+    read as 'str' become strings with NaN where they are empty.
+    """
+    path = Path(path)
+    if path.suffix.lower() != '.parquet':
+        return pd.read_csv(path, usecols=usecols, dtype=dtype, skiprows=skiprows, **options)
+    frame = pq.read_table(path, columns=usecols).to_pandas()
+    if skiprows is not None:
+        keep = ~np.isin(np.arange(1, len(frame) + 1), np.asarray(skiprows))
+        frame = frame[keep].reset_index(drop=True)
+    for col, kind in (dtype or {}).items():
+        if kind == 'str' and frame[col].dtype != object:
+            frame[col] = frame[col].map(str, na_action='ignore')
+    return frame
+
+
+class LocalSheetConnection(BaseConnection[Path]):
+    """A stand-in for ``GSheetsConnection`` serving a local CSV or Parquet file.
+
+    The file comes from the ``path`` argument of ``st.connection`` or from
+    ``path`` in the connection's secrets. Every worksheet is read from that
+    one file, and ``ttl`` is ignored because the snapshot store already
+    decides how often to read.
+    """
+
+    def _connect(self, path=None, **kwargs):
+        path = path or self._secrets.get('path')
+        if not path:
+            raise ValueError(f"LocalSheetConnection needs a path (or set {DATA_SOURCE_ENV})")
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"No SRR sheet file at {path}")
+        return path
+
+    @property
+    def path(self):
+        return self._instance
+
+    def read(self, *, worksheet=None, ttl=None, **options):
+        return read_fixture(self._instance, **options)
+
+
+def open_connection():
+    """The connection the snapshot store reads the worksheet through."""
+    path = os.environ.get(DATA_SOURCE_ENV)
+    if path:
+        return st.connection('srr_local', type=LocalSheetConnection, path=path)
+    # Imported here so a local run does not need the Google Sheets client
+    from streamlit_gsheets import GSheetsConnection
+    return st.connection('gsheets', type=GSheetsConnection)
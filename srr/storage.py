@@ -0,0 +1,53 @@
+"""On-disk copy of the normalized SRR snapshot (Parquet).
+
+The file lets a restarted server serve the last snapshot immediately and
+keeps the dashboards up when Google Sheets is unreachable.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / '.srr_cache' / 'snapshot.parquet'
+# Bump when the normalized frame changes shape so stale files are ignored
+SNAPSHOT_FORMAT = 5
+_METADATA_KEY = b'srr_snapshot'
+
+
+def save_snapshot(frame, stamp, path=SNAPSHOT_PATH):
+    """Write ``frame`` and its version ``stamp`` (a JSON-able dict) to ``path``.
+
+    The file is written next to the target and renamed into place, so readers
+    never see a partial snapshot.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    stamp = dict(stamp, format=SNAPSHOT_FORMAT)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_METADATA_KEY] = json.dumps(stamp).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_saved_snapshot(path=SNAPSHOT_PATH):
+    """Return ``(frame, stamp)`` from ``path``, or None if there is no usable file."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+        stamp = json.loads((table.schema.metadata or {}).get(_METADATA_KEY, b'{}'))
+    except (OSError, ValueError, pa.ArrowException):
+        logger.warning("Ignoring unreadable SRR snapshot at %s", path, exc_info=True)
+        return None
+    if stamp.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return table.to_pandas(), stamp
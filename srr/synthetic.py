@@ -0,0 +1,192 @@
+"""Synthetic "Response and Survey Form" sheets for offline runs and benchmarks.
+
+Usage: python -m srr.synthetic ROWS PATH [--seed N] [--days N]
+
+Writes ROWS synthetic cases to PATH (.csv or .parquet). Point
+``SRR_DATA_SOURCE`` at the file to run the pages on it.
+
+The rows have every column of ``srr.schema.SHEET_SCHEMA``, as text, in the
+sheet's formats, and they are in creation order like the sheet. They are
+skewed like the real data:
+
+- Most cases are created on weekday working hours.
+- A few SMEs, requestors, Services and Case Reasons get most of the cases.
+- Response times are long-tailed.
+- Some durations are blank, negative or not durations at all.
+- Only the newest cases are still open.
+- Most cases have no survey.
+
+The same ``seed`` always gives the same sheet.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from srr.schema import SHEET_SCHEMA
+
+SERVICES = ['VCC', 'AMC', 'Network', 'WFO', 'CRM']
+SERVICE_WEIGHTS = [0.45, 0.22, 0.15, 0.12, 0.06]
+CASE_REASONS = [
+    'Login Issue', 'Call Routing', 'Report Request', 'Outage', 'Configuration Change',
+    'License', 'Recording Lookup', 'Training', 'Schedule Adherence', 'Integration',
+    'Hardware', 'Other',
+]
+INQUIRIES = [
+    'Agent cannot log in', 'Calls not reaching queue', 'Need a report pulled',
+    'Dashboard not loading', 'Please update skill assignment', 'Missing recording',
+]
+SME_COUNT = 40
+REQUESTOR_COUNT = 600
+# Survey scores 1-5; most surveyed cases score well
+SURVEY_WEIGHTS = [0.04, 0.04, 0.1, 0.22, 0.6]
+# Share of cases created in each hour of a weekday; weekends get WEEKEND_SHARE of it
+HOUR_WEIGHTS = np.array([1, 1, 1, 1, 2, 6, 9, 10, 10, 10, 9, 9, 8, 8, 7, 6, 4, 3, 2, 2, 2, 1, 1, 1], dtype=float)
+WEEKEND_SHARE = 0.2
+WORKING_HOURS = (5, 16)
+# Share of the newest cases still open, and of the rest left open by mistake
+OPEN_TAIL = 0.002
+STRAY_OPEN = 0.0005
+# Share of each duration column that is blank, negative (clock skew) or junk
+BLANK_DURATIONS = 0.03
+NEGATIVE_DURATIONS = 0.003
+JUNK_DURATIONS = 0.007
+JUNK_VALUES = ['#VALUE!', '#REF!', '1:2', '00:61', 'pending', '1 day']
+
+
+def _zipf(count, exponent=1.1):
+    weights = 1 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _hms(seconds):
+    """``H:MM:SS`` text of an int array, formatting each distinct value once."""
+    values, inverse = np.unique(seconds, return_inverse=True)
+    text = np.array(
+        [f"{'-' if s < 0 else ''}{abs(s) // 3600}:{abs(s) // 60 % 60:02d}:{abs(s) % 60:02d}" for s in values],
+        dtype=object,
+    )
+    return text[inverse]
+
+
+def _by_code(codes, labels):
+    """``labels[codes]`` as an object array, with -1 codes as None."""
+    labels = np.append(np.asarray(labels, dtype=object), None)
+    return labels[np.where(codes < 0, len(labels) - 1, codes)]
+
+
+def synthetic_sheet(rows, seed=0, start='2025-01-01', days=365):
+    """A raw sheet of ``rows`` cases created over ``days`` days from ``start``.
+
+    Shaped like ``read_sheet``'s result: every column of ``SHEET_SCHEMA`` as
+    text (None where empty) and a RangeIndex in sheet order.
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(labels, p=None, missing=0.0):
+        codes = rng.choice(len(labels), size=rows, p=p)
+        if missing:
+            codes[rng.random(rows) < missing] = -1
+        return _by_code(codes, labels)
+
+    # Creation times: weekdays and working hours are busiest
+    calendar = pd.date_range(start, periods=days, freq='D')
+    day_weights = np.where(calendar.dayofweek >= 5, WEEKEND_SHARE, 1.0)
+    day = np.sort(rng.choice(days, size=rows, p=day_weights / day_weights.sum()))
+    hour = rng.choice(24, size=rows, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    second = rng.integers(0, 3600, size=rows)
+    order = np.lexsort((second, hour, day))
+    day, hour, second = day[order], hour[order], second[order]
+
+    weekday = calendar.dayofweek.to_numpy()[day]
+    working = (weekday < 5) & (hour >= WORKING_HOURS[0]) & (hour < WORKING_HOURS[1])
+    clock = np.array([f'{h:02d}:{s // 60:02d}:{s % 60:02d}' for h in range(24) for s in range(3600)], dtype=object)
+    dates = np.array(calendar.strftime('%m/%d/%Y'), dtype=object)
+
+    # The newest cases are the open ones, plus a few forgotten older ones
+    status = np.full(rows, 'Resolved', dtype=object)
+    open_rows = np.arange(rows) >= rows - max(1, int(rows * OPEN_TAIL))
+    open_rows |= rng.random(rows) < STRAY_OPEN
+    status[open_rows] = np.where(rng.random(open_rows.sum()) < 0.5, 'In Queue', 'In Progress')
+    in_queue = status == 'In Queue'
+
+    smes = [f'SME {i + 1:02d}' for i in range(SME_COUNT)]
+    sme_p = _zipf(SME_COUNT)
+    on_it_sme = rng.choice(SME_COUNT, size=rows, p=sme_p)
+    # The SME who picks a case up usually attends it too
+    attendee = np.where(rng.random(rows) < 0.85, on_it_sme, rng.choice(SME_COUNT, size=rows, p=sme_p))
+    on_it_sme[in_queue] = -1
+    attendee[open_rows] = -1
+
+    on_it = np.rint(rng.lognormal(np.log(180), 1.0, size=rows)).astype(np.int64)
+    attended = on_it + np.rint(rng.lognormal(np.log(1800), 1.2, size=rows)).astype(np.int64)
+
+    def durations(seconds, blank):
+        text = _hms(seconds)
+        draw = rng.random(rows)
+        negative = draw < NEGATIVE_DURATIONS
+        text[negative] = _hms(-seconds[negative])
+        junk = (draw >= NEGATIVE_DURATIONS) & (draw < NEGATIVE_DURATIONS + JUNK_DURATIONS)
+        text[junk] = rng.choice(np.array(JUNK_VALUES, dtype=object), size=junk.sum())
+        text[blank | (rng.random(rows) < BLANK_DURATIONS)] = None
+        return text
+
+    ids = range(1000, 1000 + rows)
+    case_numbers = np.array([f'{i:,}' for i in ids], dtype=object)
+    surveyed = ~open_rows & (rng.random(rows) < 0.3)
+    survey = np.where(surveyed, rng.choice(5, size=rows, p=SURVEY_WEIGHTS), -1)
+
+    data = {col: np.full(rows, None, dtype=object) for col in SHEET_SCHEMA}
+    data.update({
+        'Case #': case_numbers,
+        'Service': pick(SERVICES, p=SERVICE_WEIGHTS),
+        'Inquiry': pick(INQUIRIES),
+        'Requestor': pick([f'Requestor {i + 1:03d}' for i in range(REQUESTOR_COUNT)], p=_zipf(REQUESTOR_COUNT)),
+        'Creation Timestamp': dates[day] + ' ' + clock[hour * 3600 + second],
+        'In process (On It SME)': _by_code(on_it_sme, smes),
+        'SME': _by_code(attendee, smes),
+        'Attendee': _by_code(attendee, smes),
+        'Message Link': 'https://chat.example.com/srr/' + np.array([str(i) for i in ids], dtype=object),
+        'Status': status,
+        'Case Reason': pick(CASE_REASONS, p=_zipf(len(CASE_REASONS), 0.8), missing=0.04),
+        'TimeTo: On It': durations(on_it, in_queue),
+        'TimeTo: Attended': durations(attended, open_rows),
+        'Month': np.array(calendar.strftime('%B'), dtype=object)[day],
+        'Day': np.array(calendar.strftime('%A'), dtype=object)[day],
+        'Weekend?': np.where(weekday >= 5, 'Yes', 'No').astype(object),
+        'Date Created': dates[day],
+        'Working Hours?': np.where(working, 'Yes', 'No').astype(object),
+        'Survey': _by_code(survey, ['1', '2', '3', '4', '5']),
+        'Hour_Created': _by_code(hour, [str(h) for h in range(24)]),
+    })
+    return pd.DataFrame(data)
+
+
+def write_fixture(frame, path):
+    """Write a sheet to ``path`` as CSV or Parquet (by suffix), every column as text."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == '.parquet':
+        schema = pa.schema([(col, pa.string()) for col in frame.columns])
+        pq.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False), path)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m srr.synthetic', description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int, help="number of cases, e.g. 10000 to 5000000")
+    parser.add_argument('path', help="output file, .csv or .parquet")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--days', type=int, default=365, help="days the cases are spread over")
+    args = parser.parse_args(argv)
+    path = write_fixture(synthetic_sheet(args.rows, seed=args.seed, days=args.days), args.path)
+    print(f"Wrote {args.rows:,} cases to {path}")
+
+
+if __name__ == '__main__':
+    main()
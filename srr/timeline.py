@@ -0,0 +1,61 @@
+"""Date Created range queries over a snapshot, by binary search.
+
+The "Select Delta Range" metrics average the On It and Attended durations
+of every case of a segment created within a date range. The frame stays in
+sheet order (incremental refreshes splice it by row position), so each
+segment keeps its own creation times as a sorted int64 epoch array with
+prefix sums of the measures the averages need. A range is then two
+``searchsorted`` calls and a difference of prefix sums, however long the
+history.
+"""
+import numpy as np
+import pandas as pd
+
+from srr.aggregates import row_measures
+from srr.filters import SEGMENTS
+
+# Measures the range averages are built from
+RANGE_MEASURES = ('on_it_sum', 'on_it_valid', 'attended_sum', 'attended_valid')
+
+
+def _epoch(value):
+    """Nanoseconds since the epoch (UTC) of a timezone-aware datetime."""
+    return pd.Timestamp(value).value
+
+
+class _Timeline:
+    """Sorted creation times of some rows and the prefix sums of their measures."""
+
+    def __init__(self, created, measures):
+        dated = created != np.iinfo(np.int64).min  # NaT never falls in a range
+        order = np.flatnonzero(dated)
+        order = order[np.argsort(created[order], kind='stable')]
+        self.epochs = created[order]
+        sums = np.zeros((len(order) + 1, len(RANGE_MEASURES)))
+        # Durations are whole seconds, so float64 prefix sums stay exact
+        np.cumsum(np.column_stack([measures[m][order] for m in RANGE_MEASURES]), axis=0, out=sums[1:])
+        self.sums = sums
+
+    def totals(self, start, end):
+        lo = np.searchsorted(self.epochs, start, side='left')
+        hi = np.searchsorted(self.epochs, end, side='right')
+        return dict(zip(RANGE_MEASURES, self.sums[hi] - self.sums[lo]))
+
+
+class TimeIndex:
+    """Per-segment timelines of one snapshot; never modified once built."""
+
+    def __init__(self, frame):
+        created = frame['Date Created'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        measures = row_measures(frame)
+        working_hours = frame['Working Hours?'].to_numpy()
+        self._timelines = {}
+        for segment, wanted in SEGMENTS.items():
+            rows = slice(None) if wanted is None else working_hours == wanted
+            self._timelines[segment] = _Timeline(
+                created[rows], {m: measures[m][rows] for m in RANGE_MEASURES},
+            )
+
+    def totals(self, segment, start, end):
+        """``RANGE_MEASURES`` summed over the segment's cases created in [start, end]."""
+        return self._timelines[segment].totals(_epoch(start), _epoch(end))
@@ -0,0 +1,218 @@
+"""Timing spans for page reruns.
+
+When timing is on, ``render_page`` records how long each section of a rerun
+takes: getting the snapshot, the filters, each panel aggregate and each
+chart build. Whatever a section spends outside its nested spans is
+rendering. Each rerun then ends with:
+
+- a breakdown in the sidebar
+- one JSON record on the ``srr.timing`` logger, at INFO (the first record
+  gives the logger that level, and a stderr handler when no handler would
+  get its records)
+- when ``SRR_TIMING_LOG`` names a file, the same record appended to it
+  (one JSON object per line)
+
+The record also holds how long the ingest stages of the snapshot took:
+read, enrich (``load_data``) and index. These run on the ingestion worker,
+not in the rerun.
+
+Timing is on for every session when ``SRR_TIMING`` is set (to anything but
+0), and for one session when its URL has ``?timing=1``. When it is off,
+``span`` returns one shared do-nothing context manager, so each section
+costs a thread-local lookup.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Set to time every session's reruns
+TIMING_ENV = 'SRR_TIMING'
+# File each rerun's record is appended to, as a JSON line
+TIMING_LOG_ENV = 'SRR_TIMING_LOG'
+# ?timing=1 times one session's reruns
+TIMING_QUERY_PARAM = 'timing'
+
+# The timings of the rerun running on this thread, if it is being timed.
+# Each session's script runs on its own thread.
+_local = threading.local()
+_log_lock = threading.Lock()
+_logger_ready = False
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ('_timings', '_name', '_index')
+
+    def __init__(self, timings, name):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self):
+        self._index = self._timings._open(self._name)
+        return self
+
+    def __exit__(self, *exc):
+        self._timings._close(self._index)
+        return False
+
+
+class RerunTimings:
+    """The spans of one page rerun, in the order they started.
+
+    Each span is a dict with its ``name``, nesting ``depth``, and ``start``
+    and ``seconds`` relative to the start of the rerun.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.started_at = time.time()
+        self.seconds = None
+        self.spans = []
+        self._start = time.perf_counter()
+        self._depth = 0
+
+    def _open(self, name):
+        self.spans.append({'name': name, 'depth': self._depth, 'start': time.perf_counter() - self._start, 'seconds': None})
+        self._depth += 1
+        return len(self.spans) - 1
+
+    def _close(self, index):
+        span = self.spans[index]
+        span['seconds'] = time.perf_counter() - self._start - span['start']
+        self._depth -= 1
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start
+
+    def breakdown(self):
+        """The spans as a table with the time each spent outside nested spans.
+
+        The last row holds the part of the rerun outside every span.
+        """
+        rows = []
+        for i, span in enumerate(self.spans):
+            nested = sum(child['seconds'] or 0.0 for child in self._children(i))
+            seconds = span['seconds'] or 0.0
+            rows.append({
+                'Section': '· ' * span['depth'] + span['name'],
+                'ms': seconds * 1000,
+                'Self ms': (seconds - nested) * 1000,
+                '%': seconds / self.seconds * 100 if self.seconds else 0.0,
+            })
+        outside = self.seconds - sum(span['seconds'] or 0.0 for span in self.spans if span['depth'] == 0)
+        rows.append({'Section': '(other)', 'ms': outside * 1000, 'Self ms': outside * 1000,
+                     '%': outside / self.seconds * 100 if self.seconds else 0.0})
+        return pd.DataFrame(rows)
+
+    def _children(self, index):
+        depth = self.spans[index]['depth']
+        for span in self.spans[index + 1:]:
+            if span['depth'] <= depth:
+                return
+            if span['depth'] == depth + 1:
+                yield span
+
+    def record(self, **fields):
+        """The rerun as a JSON-able dict, with ``fields`` added."""
+        return {
+            'event': 'srr.rerun',
+            'page': self.page,
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            **fields,
+            'spans': self.spans,
+        }
+
+
+def span(name):
+    """Context manager timing a section of the current rerun as ``name``.
+
+    Does nothing when the rerun is not being timed.
+    """
+    timings = getattr(_local, 'timings', None)
+    return _NO_SPAN if timings is None else _Span(timings, name)
+
+
+def timing_enabled():
+    """Whether this session's reruns are timed."""
+    flag = os.environ.get(TIMING_ENV, '')
+    if flag and flag != '0':
+        return True
+    return st.query_params.get(TIMING_QUERY_PARAM) == '1'
+
+
+@contextmanager
+def rerun_timings(page):
+    """Time the spans of the enclosed rerun; yields its ``RerunTimings``, or None.
+
+    The timings are only finished if the rerun gets to the end; a rerun cut
+    short by ``st.rerun`` or an error leaves them unfinished, and the page
+    does not log them.
+    """
+    timings = RerunTimings(page) if timing_enabled() else None
+    _local.timings = timings
+    try:
+        yield timings
+    finally:
+        _local.timings = None
+    if timings is not None:
+        timings.finish()
+
+
+def _setup_logger():
+    # Streamlit leaves the root logger at WARNING with no handler, which
+    # would silently drop the INFO records; set only what is not configured
+    with _log_lock:
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.INFO)
+        if not logger.hasHandlers():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+
+
+def log_rerun(record):
+    """Write a rerun record to the ``srr.timing`` logger and the timing log file."""
+    global _logger_ready
+    line = json.dumps(record, default=str)
+    if not _logger_ready:
+        _setup_logger()
+        _logger_ready = True
+    logger.info(line)
+    path = os.environ.get(TIMING_LOG_ENV)
+    if path:
+        try:
+            with _log_lock, open(path, 'a', encoding='utf-8') as out:
+                out.write(line + '\n')
+        except OSError:
+            logger.warning("Could not write SRR timing log %s", path, exc_info=True)
+
+
+def show_timings(timings, snapshot):
+    """Sidebar breakdown of a finished rerun and of its snapshot's ingest."""
+    with st.sidebar.expander(f"Rerun timings · {timings.seconds * 1000:.0f} ms", expanded=True):
+        st.dataframe(
+            timings.breakdown(), hide_index=True, use_container_width=True,
+            column_config={col: st.column_config.NumberColumn(format='%.1f') for col in ('ms', 'Self ms', '%')},
+        )
+        if snapshot.timings:
+            stages = ' · '.join(f"{stage} {seconds:.2f} s" for stage, seconds in snapshot.timings.items())
+            st.caption(f"Snapshot v{snapshot.version} ingest (on the worker): {stages}")
@@ -0,0 +1,86 @@
+"""The panel aggregation engine gives the same tables as the groupbys it replaced."""
+import pandas as pd
+import pytest
+
+from srr.aggregates import PanelAggregates
+from srr.cube import RollupCube
+from srr.filters import FilterIndex
+from srr.snapshot import load_data
+from srr.synthetic import synthetic_sheet
+
+
+def legacy_panels(df):
+    """The groupbys the pages ran per panel, one pass each."""
+    sme = df[df['SME'].notna()].groupby(['SME', 'Service'], observed=True).size().sort_index().reset_index(name='count')
+    service_counts = df['Service'].value_counts()
+    service_counts = service_counts[service_counts > 0].reset_index()
+    service_counts.columns = ['Service', 'Count']
+    on_it = df.groupby('Case Reason', observed=True)['TimeTo: On It Sec'].mean().sort_index()
+    attended = df.groupby('Case Reason', observed=True)['TimeTo: Attended Sec'].mean().sort_index()
+    return {
+        'hour_service': df.groupby(['Hour_Created', 'Service'], observed=True).size().sort_index().unstack(fill_value=0).reset_index(),
+        'hour_on_it': df.groupby('Hour_Created')[['TimeTo: On It Sec']].mean().reset_index(),
+        'hour_case_reason': df.pivot_table(index='Hour_Created', columns='Case Reason', values='Service', aggfunc='count', fill_value=0, observed=True).reset_index(),
+        'month_times': df.groupby('Month', observed=True).agg({'TimeTo: On It Sec': 'mean', 'TimeTo: Attended Sec': 'mean'}).sort_index().reset_index(),
+        'service_times': df.groupby('Service', observed=True).agg({'TimeTo: On It Sec': 'mean', 'TimeTo: Attended Sec': 'mean'}).sort_index().reset_index(),
+        'case_reason_counts': df.groupby('Case Reason', observed=True)['Service'].count().sort_index().reset_index(),
+        'case_reason_times': pd.concat([on_it, attended], axis=1).reset_index(),
+        'service_counts': service_counts,
+        'sme_service': sme,
+        'requestor_service': df.pivot_table(index='Requestor', columns='Service', aggfunc='size', fill_value=0, observed=True).sort_index().reset_index(),
+        'sme_summary': df.groupby('SME (On It)', observed=True).agg(
+            Avg_On_It_Sec=pd.NamedAgg(column='TimeTo: On It Sec', aggfunc='mean'),
+            Avg_Attended_Sec=pd.NamedAgg(column='TimeTo: Attended Sec', aggfunc='mean'),
+            Number_of_Interactions=pd.NamedAgg(column='SME (On It)', aggfunc='count'),
+            Avg_Survey=pd.NamedAgg(column='Survey', aggfunc='mean'),
+        ).sort_index().reset_index(),
+    }
+
+
+def assert_same_panels(engine, df):
+    """Raise if ``engine``'s tables and the legacy groupbys over ``df`` disagree."""
+    for name, expected in legacy_panels(df).items():
+        actual = getattr(engine, name)
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_column_type=False,
+            check_index_type=False,
+            check_names=False,
+            obj=name,
+        )
+        assert list(actual.columns) == list(expected.columns), name
+
+
+
+
+@pytest.fixture(scope='module')
+def frame():
+    raw = synthetic_sheet(3000, days=90)
+    # Missing keys in every grouped column
+    raw.loc[raw.index[::89], ['Case Reason', 'Requestor', 'Hour_Created', 'Month']] = None
+    return load_data(raw)
+
+
+def _views(frame):
+    services = [None, *frame['Service'].cat.categories[:2]]
+    months = [None, *frame['Month'].cat.categories[:2]]
+    for segment in ('all', 'working', 'off'):
+        for service in services:
+            for month in months:
+                yield segment, service, month
+
+
+def test_engine_on_rows_equals_groupbys(frame):
+    filters = FilterIndex(frame)
+    for segment, service, month in _views(frame):
+        rows = filters.select(segment, service, month)
+        assert_same_panels(PanelAggregates(rows), rows)
+
+
+def test_engine_on_cube_cells_equals_groupbys(frame):
+    filters, cube = FilterIndex(frame), RollupCube.build(frame)
+    for segment, service, month in _views(frame):
+        rows = filters.select(segment, service, month)
+        cells = (cube.cells(name, segment, service, month) for name in ('hourly', 'sme', 'sme_on_it', 'requestor'))
+        assert_same_panels(PanelAggregates.from_cells(*cells), rows)
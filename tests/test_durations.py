@@ -0,0 +1,63 @@
+"""The vectorized duration helpers agree with the scalar versions and with pandas."""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from srr.durations import duration_columns, format_hms, format_minutes_hms, parse_durations, seconds_to_hms
+
+SECONDS = [
+    np.nan, 0.0, 0.4, -0.4, 59.6, -1.0, -59.9, -61.5, -3600.0, 3599.0, 86399.0,
+    99 * 3600 + 3599, 100 * 3600 + 61.7, -123 * 3600 - 5, 1e7,
+]
+MINUTES = [0.0, 0.4, 59.9, 60.0, 61.5, 1439.9, 100 * 60 + 1, 6000.5, 1e5]
+DURATIONS = [
+    '0:00:00', '0:05:09', '12:34:56', '-0:05:00', '+1:00:00', ' 1:00:00 ', '0:00:61', '25:00:00',
+    '123:04:05', '1 day', '1 days 02:00:00', '1:02:03.5', '1:2:3',
+    '00:61', '1:2', '#VALUE!', '#REF!', 'pending', '', None, np.nan,
+]
+
+
+def minutes_to_hms(minutes):
+    """The pages' scalar formatter that ``format_minutes_hms`` replaced."""
+    hours = int(minutes // 60)
+    mins = int(minutes % 60)
+    secs = 0
+    return f"{hours:02d}:{mins:02d}:{secs:02d}"
+
+
+def test_format_hms_equals_seconds_to_hms():
+    values = pd.Series(SECONDS, index=range(10, 10 + len(SECONDS)))
+    expected = pd.Series([seconds_to_hms(value) for value in SECONDS], index=values.index, dtype=object)
+    pd.testing.assert_series_equal(format_hms(values), expected)
+
+
+def test_format_minutes_hms_equals_minutes_to_hms():
+    values = pd.Series(MINUTES)
+    expected = pd.Series([minutes_to_hms(value) for value in MINUTES], dtype=object)
+    pd.testing.assert_series_equal(format_minutes_hms(values), expected)
+
+
+def test_format_minutes_hms_nan_and_negative():
+    # minutes_to_hms raised on NaN and mangled negative means ('-1:58:00');
+    # these follow seconds_to_hms instead
+    values = pd.Series([np.nan, -0.4, -1.5, -61.0])
+    assert format_minutes_hms(values).tolist() == ['00:00:00', '-00:01:00', '-00:02:00', '-01:01:00']
+
+
+def test_parse_durations_equals_to_timedelta():
+    values = pd.Series(DURATIONS, index=range(5, 5 + len(DURATIONS)), dtype=object)
+    expected = pd.to_timedelta(values, errors='coerce').dt.total_seconds()
+    pd.testing.assert_series_equal(parse_durations(values), expected, check_names=False)
+
+
+def test_duration_columns():
+    values = pd.Series(DURATIONS, dtype=object)
+    with warnings.catch_warnings():
+        # Casting NaN seconds used to warn on every ingest
+        warnings.simplefilter('error')
+        seconds, timedelta = duration_columns(values)
+    expected = pd.to_timedelta(values, errors='coerce')
+    pd.testing.assert_series_equal(timedelta, expected, check_names=False)
+    assert seconds.dtype == np.int32
+    assert seconds.tolist() == expected.dt.total_seconds().fillna(0).astype(int).tolist()
@@ -0,0 +1,158 @@
+"""Incremental refreshes and the per-snapshot indexes agree with a full recompute."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from srr.cube import CUBOIDS, RollupCube
+from srr.filters import FILTER_COLUMNS, SEGMENTS, FilterIndex
+from srr.snapshot import SnapshotStore, load_data, merge_frames
+from srr.synthetic import synthetic_sheet
+from srr.timeline import TimeIndex
+
+ROWS = 3000
+
+
+class Sheet:
+    """An in-memory worksheet read like ``read_sheet`` reads the real one."""
+
+    def __init__(self, raw):
+        self.raw = raw.reset_index(drop=True)
+
+    def read(self, skip_rows=0):
+        data = self.raw.iloc[skip_rows:].reset_index(drop=True)
+        data.index = pd.RangeIndex(skip_rows, skip_rows + len(data))
+        return data
+
+
+def _raw(rows=ROWS, seed=0):
+    raw = synthetic_sheet(rows, seed=seed, days=90)
+    # A few cases without a Month, so every index sees missing keys
+    raw.loc[raw.index[::97], 'Month'] = None
+    return raw
+
+
+def _assert_same_cells(actual, expected):
+    assert set(actual.cuboids) == set(expected.cuboids) == set(CUBOIDS)
+    for name, dims in CUBOIDS.items():
+        keys = list(FILTER_COLUMNS + dims)
+        left = actual.cuboids[name].sort_values(keys, ignore_index=True)
+        right = expected.cuboids[name].sort_values(keys, ignore_index=True)
+        pd.testing.assert_frame_equal(left, right, obj=name)
+
+
+@pytest.fixture(scope='module')
+def frame():
+    return load_data(_raw())
+
+
+def test_incremental_refresh_equals_full_reload():
+    sheet = Sheet(_raw())
+    store = SnapshotStore(sheet.read, refresh_seconds=0)
+    store.refresh()
+    assert store.version == 1
+
+    # Edit a row inside the overlap window: close an open case with a new SME
+    edited = sheet.raw.index[-3]
+    sheet.raw.loc[edited, ['Status', 'SME', 'TimeTo: Attended', 'Survey']] = ['Resolved', 'SME 99', '0:45:10', '5']
+    # Append rows, some with a Service, Requestor and Case Reason never seen
+    extra = _raw(40, seed=1)
+    extra.loc[extra.index[::4], ['Service', 'Requestor', 'Case Reason']] = ['Fax', 'Requestor 999', 'Brand New']
+    extra.loc[extra.index[1], 'Service'] = None
+    sheet.raw = pd.concat([sheet.raw, extra], ignore_index=True)
+
+    store.refresh()
+    assert store.version == 2
+    assert store.rows_read == len(sheet.raw)
+    full = load_data(sheet.read())
+    pd.testing.assert_frame_equal(store.frame, full)
+    assert 'Fax' in store.frame['Service'].cat.categories
+    _assert_same_cells(store.snapshot.cube, RollupCube.build(full))
+
+
+def test_unchanged_sheet_keeps_the_snapshot():
+    sheet = Sheet(_raw())
+    store = SnapshotStore(sheet.read, refresh_seconds=0)
+    store.refresh()
+    snapshot = store.snapshot
+    store.refresh()
+    store.refresh(full=True)
+    assert store.version == 1
+    assert store.snapshot is snapshot
+
+
+def test_merge_frames_widens_categories(frame):
+    kept, delta = frame.iloc[:100], load_data(_raw(20, seed=2).assign(Service='Fax'))
+    merged = merge_frames(kept, delta)
+    assert isinstance(merged['Service'].dtype, pd.CategoricalDtype)
+    assert list(merged['Service'].astype(object)) == list(kept['Service'].astype(object)) + ['Fax'] * len(delta)
+
+
+def test_cube_updated_equals_build():
+    raw = _raw()
+    frame = load_data(raw)
+    start = len(raw) - 200
+    # The store's delta: the re-read tail, with edits and new rows
+    tail = pd.concat([raw.iloc[start:], _raw(30, seed=3)], ignore_index=True)
+    tail.loc[tail.index[::3], 'SME'] = 'SME 99'
+    tail.loc[tail.index[::5], 'TimeTo: On It'] = '0:10:00'
+    tail.index = pd.RangeIndex(start, start + len(tail))
+    delta = load_data(tail)
+    replaced = frame.index >= start
+    merged = merge_frames(frame.loc[~replaced], delta)
+    updated = RollupCube.build(frame).updated(frame.loc[replaced], delta, merged)
+    _assert_same_cells(updated, RollupCube.build(merged))
+
+
+def test_filter_index_select_equals_masks(frame):
+    filters = FilterIndex(frame)
+    services = [None, *frame['Service'].cat.categories, 'Fax']
+    months = [None, *frame['Month'].cat.categories]
+    for segment, working_hours in SEGMENTS.items():
+        for service in services:
+            for month in months:
+                mask = np.ones(len(frame), dtype=bool)
+                for column, wanted in zip(FILTER_COLUMNS, (service, month, working_hours)):
+                    if wanted is not None:
+                        mask &= (frame[column] == wanted).to_numpy()
+                pd.testing.assert_frame_equal(filters.select(segment, service, month), frame[mask])
+
+
+def test_time_index_means_equal_masks(frame):
+    timeline = TimeIndex(frame)
+    created = frame['Date Created']
+    first, last = created.min(), created.max()
+    ranges = [
+        (first, last),
+        (first, first),
+        (first + pd.Timedelta(days=10), first + pd.Timedelta(days=40)),
+        (last + pd.Timedelta(days=1), last + pd.Timedelta(days=30)),
+        (first - pd.Timedelta(days=30), first - pd.Timedelta(days=1)),
+    ]
+    for segment, working_hours in SEGMENTS.items():
+        rows = frame if working_hours is None else frame[frame['Working Hours?'] == working_hours]
+        for start, end in ranges:
+            totals = timeline.totals(segment, start, end)
+            in_range = rows[(rows['Date Created'] >= start) & (rows['Date Created'] <= end)]
+            for measure, column in (('on_it', 'TimeTo: On It Timedelta'), ('attended', 'TimeTo: Attended Timedelta')):
+                expected = in_range[column].dt.total_seconds().mean()
+                valid = totals[f'{measure}_valid']
+                actual = totals[f'{measure}_sum'] / valid if valid else np.nan
+                np.testing.assert_allclose(actual, expected, equal_nan=True)
+
+
+def test_restored_snapshot_refreshes_incrementally(tmp_path):
+    raw = _raw()
+    # Empty in every row, so Parquet drops its (empty) categorical dtype
+    raw['Attendee'] = None
+    sheet = Sheet(raw)
+    path = tmp_path / 'snapshot.parquet'
+    SnapshotStore(sheet.read, path=path).refresh()
+
+    store = SnapshotStore(sheet.read, path=path, refresh_seconds=0)
+    assert store.restore()
+    pd.testing.assert_frame_equal(store.frame, load_data(sheet.read()))
+    sheet.raw = pd.concat([sheet.raw, _raw(10, seed=4).assign(Attendee=None)], ignore_index=True)
+    store.refresh()
+    assert store.last_error is None
+    assert store.version == 2
+    pd.testing.assert_frame_equal(store.frame, load_data(sheet.read()))